@@ -0,0 +1,54 @@
+# benchmarks/bench_backends.py
+"""
+Compares records/sec of the available XML parser backends.
+
+Usage:
+    python -m benchmarks.bench_backends [path/to/export.xml|export.zip] [--repeat N]
+"""
+import argparse
+import time
+
+from src.constants.paths import XML_FILE_PATH
+from src.data_loading import open_export_xml
+from src.parsers.activity_parsers import ActivityRecordParser
+from src.parsers.backends import BACKENDS, lxml_etree
+from src.parsers.dispatcher import ParserDispatcher
+from src.parsers.health_parsers import HealthRecordParser
+from src.parsers.sleep_parsers import SleepDataParser
+from src.parsers.workout_parser import WorkoutDataParser
+
+PARSER_CLASSES = [
+    HealthRecordParser,
+    SleepDataParser,
+    ActivityRecordParser,
+    WorkoutDataParser,
+]
+
+
+def run_backend(file_path: str, backend: str) -> tuple:
+    """Runs a full single-pass parse with the backend and returns (records, seconds)."""
+    parsers = [parser_class(file_path) for parser_class in PARSER_CLASSES]
+    start_time = time.perf_counter()
+    with open_export_xml(file_path) as xml_file:
+        ParserDispatcher(parsers, backend).run(xml_file)
+    duration = time.perf_counter() - start_time
+    return sum(len(parser.data) for parser in parsers), duration
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument("file_path", nargs="?", default=XML_FILE_PATH)
+    arg_parser.add_argument("--repeat", type=int, default=3)
+    args = arg_parser.parse_args()
+
+    backends = [name for name in BACKENDS if name != "lxml" or lxml_etree is not None]
+    print(f"{'backend':<10} {'records':>10} {'best (s)':>10} {'records/sec':>14}")
+    for backend in backends:
+        runs = [run_backend(args.file_path, backend) for _ in range(args.repeat)]
+        records = runs[0][0]
+        best = min(duration for _, duration in runs)
+        print(f"{backend:<10} {records:>10} {best:>10.3f} {records / best:>14.0f}")
+
+
+if __name__ == "__main__":
+    main()
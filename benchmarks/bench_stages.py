@@ -0,0 +1,138 @@
+# benchmarks/bench_stages.py
+"""
+Measures records/sec and peak traced memory of each pipeline stage on a synthetic export:
+every parser's BaseParser.parse, every cleaner's clean_data, DataFrameMerger.merge_dataframes
+and the monthly summaries. Runs in a temporary directory, so data/ is left untouched.
+
+Usage:
+    python -m benchmarks.bench_stages [--years N] [--types StepCount,HeartRate,...]
+        [--seed S] [--export path/to/export.xml] [--repeat N]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from loguru import logger
+
+from benchmarks.synthetic_export import generate_export
+from src.analysis.load_dataframes import DataFrameLoader
+from src.analysis.merge_dataframes import DataFrameMerger
+from src.analysis.summaries.monthly_summary import (
+    get_monthly_mean_summary,
+    get_monthly_sum_summary,
+)
+from src.cleaners.activity_cleaner import ActivityCleaner
+from src.cleaners.health_cleaner import HealthCleaner
+from src.cleaners.sleep_cleaner import SleepCleaner
+from src.cleaners.workout_cleaner import WorkoutCleaner
+from src.constants.paths import CLEANED_DATA_DIRECTORY
+from src.data_parsing import parse_all_data
+from src.dates import DateFilter
+from src.parsers.activity_parsers import ActivityRecordParser
+from src.parsers.health_parsers import HealthRecordParser, HeartRateParser
+from src.parsers.sleep_parsers import SleepDataParser
+from src.parsers.workout_parser import WorkoutDataParser
+
+PARSER_CLASSES = [
+    HealthRecordParser,
+    SleepDataParser,
+    ActivityRecordParser,
+    WorkoutDataParser,
+    HeartRateParser,
+]
+CLEANER_CLASSES = {
+    "workout": WorkoutCleaner,
+    "health": HealthCleaner,
+    "activity": ActivityCleaner,
+    "sleep": SleepCleaner,
+}
+
+
+def measure(func, repeat: int) -> tuple:
+    """
+    Returns func's result, its best wall time over repeat runs and the peak memory
+    traced by tracemalloc in one extra run (tracing slows the timed runs down otherwise).
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start_time)
+
+    tracemalloc.start()
+    result = func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, best, peak
+
+
+def report(stage: str, records: int, seconds: float, peak: int) -> None:
+    rate = records / seconds if seconds else float("inf")
+    print(f"{stage:<32} {records:>10} {seconds:>9.3f} {rate:>13.0f} {peak / 2**20:>10.1f}")
+
+
+def run_benchmarks(export_path: str, repeat: int) -> None:
+    print(f"{'stage':<32} {'records':>10} {'best (s)':>9} {'records/sec':>13} {'peak (MB)':>10}")
+
+    for parser_class in PARSER_CLASSES:
+        data, seconds, peak = measure(lambda: parser_class(export_path).parse(), repeat)
+        report(f"{parser_class.__name__}.parse", len(data), seconds, peak)
+
+    parsed, seconds, peak = measure(
+        lambda: parse_all_data(export_path, persist=False, use_cache=False), repeat
+    )
+    report("parse_all_data", sum(len(df) for df in parsed.values()), seconds, peak)
+
+    # Every year of the synthetic export is cleaned, not only DEFAULT_YEARS
+    for category, cleaner_class in CLEANER_CLASSES.items():
+        df = parsed[category]
+        _, seconds, peak = measure(
+            lambda: cleaner_class(data=df, date_filter=DateFilter()).clean_data(), repeat
+        )
+        report(f"{cleaner_class.__name__}.clean_data", len(df), seconds, peak)
+
+    dataframes = DataFrameLoader(CLEANED_DATA_DIRECTORY).load_all_dataframes()
+    merged, seconds, peak = measure(
+        lambda: DataFrameMerger(dict(dataframes)).merge_dataframes(), repeat
+    )
+    rows = sum(len(df) for df in dataframes.values())
+    report("DataFrameMerger.merge_dataframes", rows, seconds, peak)
+
+    for summary in (get_monthly_mean_summary, get_monthly_sum_summary):
+        _, seconds, peak = measure(lambda: summary(merged), repeat)
+        report(summary.__name__, len(merged), seconds, peak)
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument("--years", type=int, default=1)
+    arg_parser.add_argument("--types", help="comma separated record types, default all")
+    arg_parser.add_argument("--seed", type=int, default=0)
+    arg_parser.add_argument("--export", help="benchmark an existing export instead")
+    arg_parser.add_argument("--repeat", type=int, default=3)
+    args = arg_parser.parse_args()
+
+    # Only warnings and errors, so the pipeline logs do not drown the results
+    logger.remove()
+    logger.add(sys.stderr, level="WARNING")
+
+    export_path = os.path.abspath(args.export) if args.export else None
+    with tempfile.TemporaryDirectory() as directory:
+        os.chdir(directory)
+        if export_path is None:
+            export_path = os.path.join(directory, "export.xml")
+            written = generate_export(
+                export_path,
+                years=args.years,
+                record_types=args.types.split(",") if args.types else None,
+                seed=args.seed,
+            )
+            print(f"Generated {written} elements ({os.path.getsize(export_path)} bytes)")
+        run_benchmarks(export_path, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,318 @@
+# benchmarks/synthetic_export.py
+"""
+Writes a deterministic synthetic Apple Health export.xml (or export.zip) for benchmarks.
+
+Usage:
+    python -m benchmarks.synthetic_export path/to/export.xml|export.zip
+        [--years N] [--end-date YYYY-MM-DD] [--types StepCount,HeartRate,...]
+        [--workouts-per-week N] [--no-sleep] [--seed S]
+"""
+import argparse
+import io
+import random
+import zipfile
+from collections import namedtuple
+from datetime import date, datetime, timedelta
+
+from src.constants.activity import (
+    HK_ENERGY_BURNED,
+    HK_EXERCISE_TIME,
+    HK_FLIGHTS_CLIMBED,
+    HK_PHYSICAL_EFFORT,
+    HK_STEP_COUNT,
+)
+from src.constants.health import (
+    HK_HEARTRATE,
+    HK_HEARTRATE_RECOVERY,
+    HK_RESPIRATORY_RATE,
+    HK_RESTING_HEARTRATE,
+    HK_RUNNING_GROUND_CONTACT_TIME,
+    HK_RUNNING_POWER,
+    HK_RUNNING_SPEED,
+    HK_RUNNING_STRIDE_LENGTH,
+    HK_RUNNING_VERTICAL_OSCILLATION,
+    HK_STAIR_ASCENT_SPEED,
+    HK_VO2_MAX,
+    HK_WALKING_HEARTRATE,
+    HK_WALKING_SPEED,
+    HK_WALKING_STEP_LENGTH,
+)
+from src.constants.paths import EXPORT_XML_MEMBER
+from src.constants.sleep import (
+    HK_RECORD_SLEEP_ANALYSIS_ASLEEP_CORE,
+    HK_RECORD_SLEEP_ANALYSIS_ASLEEP_DEEP,
+    HK_RECORD_SLEEP_ANALYSIS_ASLEEP_REM,
+    HK_RECORDS_SLEEP_ANALYSIS,
+)
+from src.constants.workout import (
+    HK_METADATA_INDOOR_WORKOUT,
+    HK_WORKOUT_CYCLING,
+    HK_WORKOUT_RUNNING,
+    HK_WORKOUT_SWIMMING,
+    HK_WORKOUT_TRADITIONAL_STRENGTH_TRAINING,
+    HK_WORKOUT_WALKING,
+    HK_WORKOUT_YOGA,
+)
+
+SOURCE_NAME = "Synthetic Watch"
+HK_SLEEP_IN_BED = "HKCategoryValueSleepAnalysisInBed"
+HK_SLEEP_AWAKE = "HKCategoryValueSleepAnalysisAwake"
+
+# Samples per day (fractions are the chance of one more sample) and a uniform value range
+RecordProfile = namedtuple(
+    "RecordProfile", ["unit", "per_day", "low", "high", "decimals"]
+)
+RECORD_PROFILES = {
+    HK_STEP_COUNT: RecordProfile("count", 40, 10, 600, 0),
+    HK_FLIGHTS_CLIMBED: RecordProfile("count", 8, 1, 4, 0),
+    HK_PHYSICAL_EFFORT: RecordProfile("kcal/hr·kg", 24, 1, 8, 1),
+    HK_EXERCISE_TIME: RecordProfile("min", 20, 1, 5, 0),
+    HK_ENERGY_BURNED: RecordProfile("kcal", 96, 0.5, 1.5, 2),
+    HK_RESTING_HEARTRATE: RecordProfile("count/min", 1, 45, 65, 0),
+    HK_VO2_MAX: RecordProfile("mL/min·kg", 0.2, 40, 52, 2),
+    HK_HEARTRATE_RECOVERY: RecordProfile("count/min", 0.5, 15, 40, 0),
+    HK_WALKING_STEP_LENGTH: RecordProfile("cm", 10, 60, 80, 0),
+    HK_RESPIRATORY_RATE: RecordProfile("count/min", 10, 12, 18, 1),
+    HK_WALKING_SPEED: RecordProfile("km/hr", 10, 3.5, 6, 2),
+    HK_STAIR_ASCENT_SPEED: RecordProfile("m/s", 2, 0.2, 0.6, 3),
+    HK_WALKING_HEARTRATE: RecordProfile("count/min", 1, 80, 110, 0),
+    HK_RUNNING_STRIDE_LENGTH: RecordProfile("m", 6, 0.9, 1.3, 2),
+    HK_RUNNING_GROUND_CONTACT_TIME: RecordProfile("ms", 6, 220, 280, 0),
+    HK_RUNNING_VERTICAL_OSCILLATION: RecordProfile("cm", 6, 7, 10, 1),
+    HK_RUNNING_SPEED: RecordProfile("km/hr", 6, 9, 14, 2),
+    HK_RUNNING_POWER: RecordProfile("W", 6, 200, 300, 0),
+    HK_HEARTRATE: RecordProfile("count/min", 300, 50, 170, 0),
+}
+# Workout type -> distance statistic (None for workouts without a distance)
+WORKOUT_DISTANCES = {
+    HK_WORKOUT_RUNNING: "HKQuantityTypeIdentifierDistanceWalkingRunning",
+    HK_WORKOUT_WALKING: "HKQuantityTypeIdentifierDistanceWalkingRunning",
+    HK_WORKOUT_CYCLING: "HKQuantityTypeIdentifierDistanceCycling",
+    HK_WORKOUT_SWIMMING: "HKQuantityTypeIdentifierDistanceSwimming",
+    HK_WORKOUT_TRADITIONAL_STRENGTH_TRAINING: None,
+    HK_WORKOUT_YOGA: None,
+}
+# Sleep stages of one cycle with their duration range in minutes
+SLEEP_CYCLE = [
+    (HK_RECORD_SLEEP_ANALYSIS_ASLEEP_CORE, 30, 60),
+    (HK_RECORD_SLEEP_ANALYSIS_ASLEEP_DEEP, 15, 40),
+    (HK_RECORD_SLEEP_ANALYSIS_ASLEEP_CORE, 10, 20),
+    (HK_RECORD_SLEEP_ANALYSIS_ASLEEP_REM, 10, 30),
+]
+
+HEADER = """<?xml version="1.0" encoding="UTF-8"?>
+<!DOCTYPE HealthData [
+<!ELEMENT HealthData (ExportDate,Me,(Record|Correlation|Workout|ActivitySummary)*)>
+<!ATTLIST Record
+  type          CDATA #REQUIRED
+>
+]>
+<HealthData locale="en_US">
+"""
+
+
+def resolve_record_types(names: list = None) -> list:
+    """Maps HK identifiers or their short names (e.g. "StepCount") to profiled identifiers."""
+    if not names:
+        return list(RECORD_PROFILES)
+    short_names = {
+        identifier.replace("HKQuantityTypeIdentifier", ""): identifier
+        for identifier in RECORD_PROFILES
+    }
+    identifiers = []
+    for name in names:
+        identifier = name if name in RECORD_PROFILES else short_names.get(name)
+        if identifier is None:
+            raise ValueError(f"No synthetic profile for record type: {name}")
+        identifiers.append(identifier)
+    return identifiers
+
+
+def format_date(moment: datetime) -> str:
+    """Formats a local time as an Apple date, with a summer (+0200) or winter (+0100) offset."""
+    offset = "+0200" if 4 <= moment.month <= 10 else "+0100"
+    return f"{moment:%Y-%m-%d %H:%M:%S} {offset}"
+
+
+def record_line(
+    record_type: str, start: datetime, end: datetime, value, unit: str = None
+) -> str:
+    """Returns one <Record/> line as written in export.xml."""
+    unit = f' unit="{unit}"' if unit is not None else ""
+    return (
+        f' <Record type="{record_type}" sourceName="{SOURCE_NAME}"{unit}'
+        f' creationDate="{format_date(end + timedelta(minutes=5))}"'
+        f' startDate="{format_date(start)}" endDate="{format_date(end)}" value="{value}"/>\n'
+    )
+
+
+def write_quantity_records(out, record_type: str, days: list, seed: int) -> int:
+    """Writes the samples of one quantity type for every day, in time order."""
+    profile = RECORD_PROFILES[record_type]
+    # Seeded per type, so selecting other types never changes these records
+    rng = random.Random(f"{seed}:{record_type}")
+    written = 0
+    for day in days:
+        count = int(profile.per_day) + (rng.random() < profile.per_day % 1)
+        seconds = sorted(rng.randrange(86400 - 60) for _ in range(count))
+        for second in seconds:
+            start = datetime.combine(day, datetime.min.time()) + timedelta(seconds=second)
+            value = round(rng.uniform(profile.low, profile.high), profile.decimals)
+            if profile.decimals == 0:
+                value = int(value)
+            end = start + timedelta(seconds=60)
+            out.write(record_line(record_type, start, end, value, profile.unit))
+        written += count
+    return written
+
+
+def write_sleep_records(out, days: list, seed: int) -> int:
+    """Writes an in-bed record and cycles of sleep stages for the night before every day."""
+    rng = random.Random(f"{seed}:{HK_RECORDS_SLEEP_ANALYSIS}")
+    written = 0
+    for day in days:
+        bedtime = datetime.combine(day, datetime.min.time()) - timedelta(
+            minutes=rng.randint(0, 120)
+        )
+        night_end = bedtime + timedelta(minutes=rng.randint(360, 510))
+        out.write(
+            record_line(HK_RECORDS_SLEEP_ANALYSIS, bedtime, night_end, HK_SLEEP_IN_BED)
+        )
+        written += 1
+
+        start = bedtime + timedelta(minutes=rng.randint(5, 20))
+        while start < night_end:
+            for stage, low, high in SLEEP_CYCLE:
+                end = min(start + timedelta(minutes=rng.randint(low, high)), night_end)
+                out.write(record_line(HK_RECORDS_SLEEP_ANALYSIS, start, end, stage))
+                written += 1
+                start = end
+                if start >= night_end:
+                    break
+            if start < night_end and rng.random() < 0.3:
+                end = start + timedelta(minutes=rng.randint(1, 5))
+                out.write(
+                    record_line(HK_RECORDS_SLEEP_ANALYSIS, start, end, HK_SLEEP_AWAKE)
+                )
+                written += 1
+                start = end
+    return written
+
+
+def write_workouts(out, days: list, workouts_per_week: float, seed: int) -> int:
+    """Writes Workout elements with nested statistics, events and metadata."""
+    rng = random.Random(f"{seed}:Workout")
+    workout_types = list(WORKOUT_DISTANCES)
+    written = 0
+    for day in days:
+        if rng.random() >= workouts_per_week / 7:
+            continue
+        workout_type = rng.choice(workout_types)
+        duration = rng.randint(20, 75)
+        start = datetime.combine(day, datetime.min.time()) + timedelta(
+            hours=17, minutes=rng.randint(0, 120)
+        )
+        end = start + timedelta(minutes=duration)
+        start_date, end_date = format_date(start), format_date(end)
+        span = f'startDate="{start_date}" endDate="{end_date}"'
+        average = rng.randint(110, 160)
+        indoor = int(rng.random() < 0.3)
+
+        out.write(
+            f' <Workout workoutActivityType="{workout_type}" duration="{duration}"'
+            f' durationUnit="min" sourceName="{SOURCE_NAME}"'
+            f' creationDate="{format_date(end + timedelta(minutes=2))}" {span}>\n'
+            f'  <MetadataEntry key="{HK_METADATA_INDOOR_WORKOUT}" value="{indoor}"/>\n'
+            f'  <WorkoutEvent type="HKWorkoutEventTypeSegment" date="{start_date}"'
+            f' duration="{duration / 2:.1f}" durationUnit="min"/>\n'
+            f'  <WorkoutStatistics type="HKQuantityTypeIdentifierActiveEnergyBurned" {span}'
+            f' sum="{duration * rng.uniform(6, 12):.1f}" unit="kcal"/>\n'
+            f'  <WorkoutStatistics type="HKQuantityTypeIdentifierHeartRate" {span}'
+            f' average="{average}" minimum="{average - 40}" maximum="{average + 25}"'
+            f' unit="count/min"/>\n'
+        )
+        distance_type = WORKOUT_DISTANCES[workout_type]
+        if distance_type is not None:
+            out.write(
+                f'  <WorkoutStatistics type="{distance_type}" {span}'
+                f' sum="{duration * rng.uniform(0.08, 0.4):.2f}" unit="km"/>\n'
+            )
+        out.write(" </Workout>\n")
+        written += 1
+    return written
+
+
+def write_export(
+    out,
+    years: int = 1,
+    end_date: str = "2024-12-31",
+    record_types: list = None,
+    sleep: bool = True,
+    workouts_per_week: float = 4,
+    seed: int = 0,
+) -> int:
+    """Writes a synthetic export to a text stream and returns the number of elements written."""
+    last = date.fromisoformat(end_date)
+    first = date(last.year - years + 1, 1, 1)
+    days = [first + timedelta(days=i) for i in range((last - first).days + 1)]
+
+    export_date = format_date(datetime.combine(last, datetime.max.time()))
+    out.write(HEADER)
+    out.write(f' <ExportDate value="{export_date}"/>\n')
+    out.write(' <Me HKCharacteristicTypeIdentifierDateOfBirth=""/>\n')
+    # Like a real export: records grouped by type, then workouts, then activity summaries
+    written = 0
+    for record_type in resolve_record_types(record_types):
+        written += write_quantity_records(out, record_type, days, seed)
+    if sleep:
+        written += write_sleep_records(out, days, seed)
+    if workouts_per_week:
+        written += write_workouts(out, days, workouts_per_week, seed)
+    for day in days:
+        out.write(f' <ActivitySummary dateComponents="{day}" activeEnergyBurned="500"/>\n')
+    out.write("</HealthData>\n")
+    return written
+
+
+def generate_export(path: str, **options) -> int:
+    """
+    Writes a synthetic export.xml, or export.zip if path ends with .zip.
+    options are passed to write_export. Returns the number of elements written.
+    """
+    if path.endswith(".zip"):
+        # A fixed timestamp keeps the archive byte-for-byte reproducible
+        info = zipfile.ZipInfo(EXPORT_XML_MEMBER, date_time=(2024, 1, 1, 0, 0, 0))
+        info.compress_type = zipfile.ZIP_DEFLATED
+        with zipfile.ZipFile(path, "w") as archive:
+            with archive.open(info, "w") as member:
+                with io.TextIOWrapper(member, encoding="utf-8") as out:
+                    return write_export(out, **options)
+    with open(path, "w", encoding="utf-8") as out:
+        return write_export(out, **options)
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument("path")
+    arg_parser.add_argument("--years", type=int, default=1)
+    arg_parser.add_argument("--end-date", default="2024-12-31")
+    arg_parser.add_argument("--types", help="comma separated record types, default all")
+    arg_parser.add_argument("--workouts-per-week", type=float, default=4)
+    arg_parser.add_argument("--no-sleep", action="store_true")
+    arg_parser.add_argument("--seed", type=int, default=0)
+    args = arg_parser.parse_args()
+
+    written = generate_export(
+        args.path,
+        years=args.years,
+        end_date=args.end_date,
+        record_types=args.types.split(",") if args.types else None,
+        sleep=not args.no_sleep,
+        workouts_per_week=args.workouts_per_week,
+        seed=args.seed,
+    )
+    print(f"Wrote {written} elements to {args.path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,24 @@
 # main.py
 import os
-from src.data_loading import unzip_export
+from src.constants.dates import DEFAULT_YEARS
+from src.constants.paths import XML_FILE_PATH, ZIP_FILE_PATH
+from src.dates import DateFilter
 from src.data_parsing import parse_all_data
 from src.data_cleaning import clean_all_data
+from src.profiling import RunProfiler
 
 
 def main() -> None:
-    unzip_export()
-    parse_all_data()
-    clean_all_data()
+    # Stream export.xml straight out of export.zip when the archive is present
+    source = ZIP_FILE_PATH if os.path.exists(ZIP_FILE_PATH) else XML_FILE_PATH
+    # Records outside the date window are skipped while parsing
+    date_filter = DateFilter(years=DEFAULT_YEARS)
+    # Per-stage timings and memory, saved as a JSON run report in data/reports/
+    profiler = RunProfiler()
+    # Hand the parsed DataFrames straight to the cleaners
+    parsed_data = parse_all_data(source, date_filter=date_filter, profiler=profiler)
+    clean_all_data(parsed_data, date_filter=date_filter, profiler=profiler)
+    profiler.save_report()
 
 
 if __name__ == "__main__":
@@ -1,5 +1,6 @@
 # src/analysis/analysis.py
 
+from src.analysis.daily_cube import DailyCube
 from src.analysis.load_dataframes import DataFrameLoader
 from src.analysis.merge_dataframes import DataFrameMerger
 from src.analysis.summaries.monthly_summary import (
@@ -10,9 +11,8 @@ from src.constants.paths import CLEANED_DATA_DIRECTORY
 
 
 def load_dataframes():
-    loader = DataFrameLoader(CLEANED_DATA_DIRECTORY)
-    dataframes = loader.load_all_dataframes()
-    return dataframes
+    # Lazy mapping: each CSV file is only read when it is first used
+    return DataFrameLoader(CLEANED_DATA_DIRECTORY)
 
 
 def get_merged_dataframe(dataframes):
@@ -23,10 +23,17 @@ def get_merged_dataframe(dataframes):
     return merged_df
 
 
-if __name__ == "__main__":
-    dataframes = load_dataframes()
+def load_merged_dataframe():
+    # Read the merged daily frame from the daily cube, refreshed from new cleaned partitions
+    cube = DailyCube().refresh()
+    if cube.matrix is None or not cube.metrics:
+        # No partitioned cleaned data yet; merge the cleaned CSV files instead
+        return get_merged_dataframe(load_dataframes())
+    return cube.to_merged_frame()
+
 
-    merged_df = get_merged_dataframe(dataframes)
+if __name__ == "__main__":
+    merged_df = load_merged_dataframe()
 
     monthly_mean_summary = get_monthly_mean_summary(df=merged_df)
     monthly_sum_summary = get_monthly_sum_summary(df=merged_df)
@@ -0,0 +1,282 @@
+# src/analysis/daily_cube.py
+import json
+import os
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+from src.analysis.utils import map_weekdays_and_months
+from src.constants.paths import CLEANED_DATA_DIRECTORY, DAILY_CUBE_DIRECTORY
+from src.partitions import PARTITION_FILE_NAME, list_partitions, partition_path
+from src.utils import find_frame_file, load_frame_from_file
+
+# Categories in the order their metrics appear in the merged frame
+METRIC_CATEGORIES = ["activity", "health", "workout", "sleep"]
+# Categories whose durations (in minutes) are summed into daily hours
+HOUR_METRICS = {"workout": "Workout Hours", "sleep": "Sleep Hours"}
+
+MATRIX_FILE = "daily_metrics.npy"
+INDEX_FILE = "daily_metrics.json"
+
+
+def widen_float32(values: np.ndarray) -> np.ndarray:
+    """
+    Converts float32 values to float64, rounded to the 7 significant digits float32 holds.
+    This turns e.g. 47.099998 back into 47.1, so sums and means match the cleaned data.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    magnitude = np.zeros_like(values)
+    np.log10(np.abs(values), out=magnitude, where=np.isfinite(values) & (values != 0))
+    scale = 10.0 ** (6 - np.floor(magnitude))
+    return np.round(values * scale) / scale
+
+
+def daily_metrics(category: str, df: pd.DataFrame) -> pd.DataFrame:
+    """Returns one row per day and one column per metric for cleaned data of a category."""
+    days = pd.to_datetime(df["date"]).dt.normalize().rename("date")
+    if category in HOUR_METRICS:
+        hours = df.groupby(days)["duration"].sum() / 60
+        return hours.to_frame(HOUR_METRICS[category])
+    return df.pivot_table(index=days, columns="type", values="value", observed=True)
+
+
+class DailyCube:
+    """
+    Dense float32 matrix of daily metrics (days x metrics), memory-mapped from disk.
+    It is built from the partitioned cleaned data and refreshed one month partition at a time.
+    """
+
+    def __init__(
+        self, directory: str = DAILY_CUBE_DIRECTORY, source: str = CLEANED_DATA_DIRECTORY
+    ):
+        self.directory = directory
+        self.source = source
+        self.metrics: list = []
+        self.metric_categories: dict = {}
+        # First day of the matrix, or None while it is empty
+        self.start = None
+        # "category/year=YYYY/month=MM" -> [mtime_ns, size] of the partition file
+        self.partitions: dict = {}
+        self.matrix = None
+        self.load()
+
+    @property
+    def matrix_path(self) -> str:
+        return os.path.join(self.directory, MATRIX_FILE)
+
+    @property
+    def index_path(self) -> str:
+        return os.path.join(self.directory, INDEX_FILE)
+
+    @property
+    def days(self) -> pd.DatetimeIndex:
+        """The day of each matrix row."""
+        if self.matrix is None:
+            return pd.DatetimeIndex([], name="date")
+        return pd.date_range(self.start, periods=len(self.matrix), freq="D", name="date")
+
+    def load(self) -> None:
+        """Opens the saved cube read-only; a missing or inconsistent cube is left empty."""
+        if not os.path.isfile(self.index_path) or not os.path.isfile(self.matrix_path):
+            return
+
+        with open(self.index_path) as f:
+            index = json.load(f)
+        matrix = np.load(self.matrix_path, mmap_mode="r")
+        if matrix.shape != (index["days"], len(index["metrics"])):
+            logger.warning("Daily cube index does not match its matrix, rebuilding it.")
+            return
+
+        self.metrics = index["metrics"]
+        self.metric_categories = index["metric_categories"]
+        self.start = pd.Timestamp(index["start"])
+        self.partitions = index["partitions"]
+        self.matrix = matrix
+
+    def scan_partitions(self) -> dict:
+        """Returns the current [mtime_ns, size] of every cleaned data partition."""
+        stamps = {}
+        for category in METRIC_CATEGORIES:
+            for year, month in list_partitions(self.source, category):
+                path = os.path.join(
+                    partition_path(self.source, category, year, month),
+                    PARTITION_FILE_NAME,
+                )
+                file_path = find_frame_file(path)
+                if file_path is None:
+                    continue
+                stat = os.stat(file_path)
+                key = f"{category}/year={year:04d}/month={month:02d}"
+                stamps[key] = [stat.st_mtime_ns, stat.st_size]
+        return stamps
+
+    def refresh(self) -> "DailyCube":
+        """Updates the cube from partitions that were added, changed or removed since the last refresh."""
+        current = self.scan_partitions()
+        changed = [key for key, stamp in current.items() if self.partitions.get(key) != stamp]
+        removed = [key for key in self.partitions if key not in current]
+        if not changed and not removed:
+            return self
+
+        updates = {}
+        for key in changed:
+            category, year, month = self.parse_partition_key(key)
+            path = os.path.join(
+                partition_path(self.source, category, year, month), PARTITION_FILE_NAME
+            )
+            updates[key] = daily_metrics(category, load_frame_from_file(path))
+
+        self.resize(updates)
+        self.matrix = matrix = np.lib.format.open_memmap(self.matrix_path, mode="r+")
+        # Clear the months being replaced before writing their new values
+        for key in changed + removed:
+            category, year, month = self.parse_partition_key(key)
+            rows = self.month_rows(year, month)
+            for column, metric in enumerate(self.metrics):
+                if self.metric_categories[metric] == category:
+                    matrix[rows, column] = np.nan
+
+        for key, frame in updates.items():
+            offsets = (frame.index - self.start).days.to_numpy()
+            for metric in frame.columns:
+                matrix[offsets, self.metrics.index(metric)] = frame[metric].to_numpy()
+        matrix.flush()
+        del matrix
+        self.matrix = None
+
+        self.partitions = current
+        self.save_index()
+        self.matrix = np.load(self.matrix_path, mmap_mode="r")
+        logger.info(
+            f"Daily cube refreshed from {len(changed)} changed and {len(removed)} removed partitions."
+        )
+        return self
+
+    def resize(self, updates: dict) -> None:
+        """Grows the matrix file to cover every new metric and day in updates."""
+        metrics = list(self.metrics)
+        metric_categories = dict(self.metric_categories)
+        start, end = self.start, None
+        if self.matrix is not None:
+            end = self.start + pd.Timedelta(days=len(self.matrix) - 1)
+
+        for key, frame in updates.items():
+            category, _, _ = self.parse_partition_key(key)
+            for metric in frame.columns:
+                if metric not in metric_categories:
+                    metrics.append(metric)
+                    metric_categories[metric] = category
+            if len(frame):
+                start = frame.index.min() if start is None else min(start, frame.index.min())
+                end = frame.index.max() if end is None else max(end, frame.index.max())
+
+        if start is None:
+            start = end = pd.Timestamp("1970-01-01")
+        days = (end - start).days + 1
+        if self.matrix is not None and self.matrix.shape == (days, len(metrics)):
+            return
+
+        os.makedirs(self.directory, exist_ok=True)
+        temp_path = f"{self.matrix_path}.tmp.npy"
+        matrix = np.lib.format.open_memmap(
+            temp_path, mode="w+", dtype=np.float32, shape=(days, len(metrics))
+        )
+        matrix[:] = np.nan
+        if self.matrix is not None and len(self.metrics):
+            offset = (self.start - start).days
+            matrix[offset : offset + len(self.matrix), : len(self.metrics)] = self.matrix
+        matrix.flush()
+        del matrix
+        self.matrix = None
+        os.replace(temp_path, self.matrix_path)
+
+        self.metrics = metrics
+        self.metric_categories = metric_categories
+        self.start = start
+
+    def save_index(self) -> None:
+        """Writes the metric and day index of the matrix atomically."""
+        index = {
+            "start": self.start.strftime("%Y-%m-%d"),
+            "days": int(np.load(self.matrix_path, mmap_mode="r").shape[0]),
+            "metrics": self.metrics,
+            "metric_categories": self.metric_categories,
+            "partitions": self.partitions,
+        }
+        temp_path = f"{self.index_path}.tmp"
+        with open(temp_path, "w") as f:
+            json.dump(index, f, indent=4)
+        os.replace(temp_path, self.index_path)
+
+    @staticmethod
+    def parse_partition_key(key: str) -> tuple:
+        """Splits "category/year=YYYY/month=MM" into category, year and month."""
+        category, year, month = key.split("/")
+        return category, int(year[5:]), int(month[6:])
+
+    def month_rows(self, year: int, month: int) -> slice:
+        """Returns the matrix rows of a month, clipped to the matrix."""
+        first = pd.Timestamp(year=year, month=month, day=1)
+        last = first + pd.offsets.MonthBegin(1)
+        start = max((first - self.start).days, 0)
+        stop = min((last - self.start).days, len(self.matrix))
+        return slice(start, max(start, stop))
+
+    def day_rows(self, start=None, end=None) -> slice:
+        """Returns the matrix rows between the inclusive start and end days."""
+        if self.matrix is None:
+            return slice(0, 0)
+        first = 0 if start is None else max((pd.Timestamp(start) - self.start).days, 0)
+        stop = len(self.matrix)
+        if end is not None:
+            stop = min((pd.Timestamp(end) - self.start).days + 1, stop)
+        return slice(first, max(first, stop))
+
+    def metric(self, name: str, start=None, end=None) -> np.ndarray:
+        """Returns a read-only view of one metric between the inclusive start and end days."""
+        return self.matrix[self.day_rows(start, end), self.metrics.index(name)]
+
+    def to_frame(self, start=None, end=None, metrics: list = None) -> pd.DataFrame:
+        """Returns the metrics between the inclusive start and end days, indexed by day."""
+        rows = self.day_rows(start, end)
+        metrics = metrics or self.metrics
+        columns = [self.metrics.index(metric) for metric in metrics]
+        if self.matrix is None:
+            values = np.empty((0, len(columns)))
+        else:
+            values = widen_float32(self.matrix[rows][:, columns])
+        return pd.DataFrame(values, index=self.days[rows], columns=metrics)
+
+    def to_merged_frame(self, start=None, end=None) -> pd.DataFrame:
+        """
+        Returns the same frame as DataFrameMerger.merge_dataframes: days with both activity
+        and health data, one column per metric, plus calendar columns.
+        """
+        metrics = sorted(
+            self.metrics,
+            key=lambda metric: (
+                METRIC_CATEGORIES.index(self.metric_categories[metric]),
+                metric,
+            ),
+        )
+        df = self.to_frame(start, end, metrics)
+
+        present = pd.Series(True, index=df.index)
+        for category in ("activity", "health"):
+            columns = [m for m in metrics if self.metric_categories[m] == category]
+            present &= df[columns].notna().any(axis=1)
+        df = df[present]
+
+        dates = df.index
+        calendar = pd.DataFrame(
+            {
+                "date": dates,
+                "day_of_week": dates.weekday + 1,  # Monday=1, Sunday=7
+                "month": dates.month,
+                "year": dates.year,
+            },
+            index=dates,
+        )
+        df = pd.concat([calendar, df], axis=1).reset_index(drop=True)
+        return map_weekdays_and_months(df)
@@ -1,37 +1,116 @@
 # src/analysis/load_dataframes.py
 import os
+from collections.abc import Mapping
+
 import pandas as pd
 from loguru import logger
 from src.analysis.utils import map_weekdays_and_months
+from src.partitions import read_partitions
+
+CATEGORIES = ["activity", "health", "sleep", "workout"]
+
+# Column types of the cleaned CSV files, so pandas does not have to infer them
+CSV_DTYPES = {
+    "date": str,
+    "day_of_week": "int8",
+    "month": "int8",
+    "year": "int16",
+    "type": str,
+    "unit": str,
+    "value": "float64",
+    "sleep_type": str,
+    "workout_type": str,
+    "duration": "float64",
+    "start_time": str,
+    "end_time": str,
+    "distance_unit": str,
+}
 
 
-class DataFrameLoader:
-    def __init__(self, directory: str):
+class DataFrameLoader(Mapping):
+    """
+    Read-only mapping of CSV file names (without .csv) to DataFrames.
+    Each file is loaded on first access and cached until its mtime or size changes.
+    """
+
+    def __init__(self, directory: str, usecols: list = None):
         self.directory = directory
+        # Default column projection for every file (None loads all columns)
+        self.usecols = usecols
         self.dataframes = {}
+        # (file name, usecols) -> (mtime, size, DataFrame)
+        self.cache = {}
 
-    def load_all_dataframes(self) -> dict:
-        """Load all CSV files in the directory into a dictionary of DataFrames."""
-        logger.info(f"Loading CSV files from directory: {self.directory}")
+    def __getitem__(self, key: str) -> pd.DataFrame:
+        return self.get_dataframe(key, self.usecols)
 
-        # Get all CSV files in the directory
-        for filename in os.listdir(self.directory):
-            if filename.endswith(".csv"):  # Only consider .csv files
-                file_path = os.path.join(self.directory, filename)
+    def __iter__(self):
+        if not os.path.isdir(self.directory):
+            return iter(())
+        return iter(
+            sorted(
+                filename.rsplit(".", 1)[0]
+                for filename in os.listdir(self.directory)
+                if filename.endswith(".csv")
+            )
+        )
 
-                try:
-                    # Load the CSV into a DataFrame
-                    df = pd.read_csv(file_path)
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
 
-                    # Use filename (without .csv) as the key
-                    key = filename.rsplit(".", 1)[0]
-                    self.dataframes[key] = df
+    def get_dataframe(self, key: str, usecols: list = None) -> pd.DataFrame:
+        """Load a single CSV file, reading only usecols, or return the cached DataFrame."""
+        file_path = os.path.join(self.directory, f"{key}.csv")
+        try:
+            stat = os.stat(file_path)
+        except FileNotFoundError:
+            raise KeyError(key) from None
 
-                    logger.info(f"{filename} loaded into dataframe")
-                except Exception as e:
-                    logger.error(f"Error loading {filename}: {e}")
+        cache_key = (key, tuple(usecols) if usecols is not None else None)
+        cached = self.cache.get(cache_key)
+        if cached is not None and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+            return cached[2]
+
+        columns = set(usecols) if usecols is not None else None
+        df = pd.read_csv(
+            file_path,
+            dtype=CSV_DTYPES,
+            usecols=(lambda column: column in columns) if columns is not None else None,
+        )
+        self.cache[cache_key] = (stat.st_mtime_ns, stat.st_size, df)
+        logger.info(f"{key}.csv loaded into dataframe")
+        return df
+
+    def load_all_dataframes(self) -> dict:
+        """Load all CSV files in the directory into a dictionary of DataFrames."""
+        logger.info(f"Loading CSV files from directory: {self.directory}")
+
+        for key in self:
+            try:
+                self.dataframes[key] = self[key]
+            except Exception as e:
+                logger.error(f"Error loading {key}.csv: {e}")
         logger.info(
             f"Finished loading {len(self.dataframes)} DataFrames from {self.directory}"
         )
 
         return self.dataframes
+
+    def load_partitioned_dataframes(
+        self, start=None, end=None, columns: list = None, categories: list = None
+    ) -> dict:
+        """
+        Load the partitioned cleaned data between the inclusive start and end days.
+        Only the year/month partitions in range and the requested columns (plus 'date') are read.
+        Keys match load_all_dataframes, e.g. "cleaned_health_data".
+        """
+        logger.info(f"Loading partitions from {start} to {end} in: {self.directory}")
+
+        for category in categories or CATEGORIES:
+            df = read_partitions(self.directory, category, start, end, columns)
+            if df is None:
+                continue
+            self.dataframes[f"cleaned_{category}_data"] = df
+            logger.info(f"{len(df)} rows of {category} data loaded into dataframe")
+
+        return self.dataframes
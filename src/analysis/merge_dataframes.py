@@ -13,28 +13,48 @@ class DataFrameMerger:
         self.health_df = dataframes.get("cleaned_health_data")
         self.workout_df = dataframes.get("cleaned_workout_data")
 
-    def sum_and_convert_to_hours(self, df, group_cols, sum_col, new_col_name):
-        """Groups by columns, sums the values, and converts to hours."""
+    @staticmethod
+    def date_index(df) -> pd.DatetimeIndex:
+        """Returns the 'date' column of a cleaned DataFrame as a DatetimeIndex of days."""
+        dates = pd.to_datetime(df["date"], format="%Y-%m-%d")
+        return pd.DatetimeIndex(dates, name="date")
 
+    def sum_and_convert_to_hours(self, df, sum_col, new_col_name) -> pd.Series:
+        """Sums a minutes column per day and converts it to hours, indexed by date."""
         try:
-            summed_df = df.groupby(group_cols)[sum_col].sum().reset_index()
-            summed_df[new_col_name] = summed_df[sum_col] / 60
-            return summed_df.drop(columns=[sum_col])
+            summed = df.groupby(self.date_index(df))[sum_col].sum() / 60
+            return summed.rename(new_col_name)
         except Exception as e:
             logger.error(f"Error summing and converting {sum_col}: {e}")
             raise
 
-    def pivot_data(self, df, index_cols, pivot_col, value_col):
-        """Pivots the dataframe based on specified index and column values."""
+    def pivot_data(self, df, pivot_col, value_col) -> pd.DataFrame:
+        """Pivots the dataframe to one column per pivot_col value, indexed by date."""
         try:
-            pivoted_df = df.pivot_table(
-                index=index_cols, columns=pivot_col, values=value_col
-            ).reset_index()
-            return pivoted_df
+            return df.pivot_table(
+                index=self.date_index(df),
+                columns=pivot_col,
+                values=value_col,
+                observed=True,
+            )
         except Exception as e:
             logger.error(f"Error pivoting data: {e}")
             raise
 
+    def add_calendar_columns(self, df) -> pd.DataFrame:
+        """Turns the date index into 'date', 'day_of_week', 'month' and 'year' columns."""
+        dates = df.index
+        calendar = pd.DataFrame(
+            {
+                "date": dates,
+                "day_of_week": dates.weekday + 1,  # Monday=1, Sunday=7
+                "month": dates.month,
+                "year": dates.year,
+            },
+            index=dates,
+        )
+        return pd.concat([calendar, df], axis=1).reset_index(drop=True)
+
     def map_weekdays_and_months(self, df):
         try:
             df["day_of_week"] = df["day_of_week"].map(WEEKDAY_MAPPING)
@@ -45,53 +65,34 @@ class DataFrameMerger:
             raise
 
     def merge_dataframes(self):
-        """Merges all dataframes on common date columns."""
+        """Merges all dataframes on a shared index of days."""
         try:
-            # Summing and converting sleep and workout durations
-            summed_sleep_df = self.sum_and_convert_to_hours(
-                self.sleep_df,
-                ["date", "day_of_week", "month", "year"],
-                "duration",
-                "Sleep Hours",
-            )
-            summed_workout_df = self.sum_and_convert_to_hours(
-                self.workout_df,
-                ["date", "day_of_week", "month", "year"],
-                "duration",
-                "Workout Hours",
-            )
-            # Pivoting activity and health data
-            pivoted_activity_df = self.pivot_data(
-                self.activity_df,
-                ["date", "day_of_week", "month", "year"],
-                "type",
-                "value",
+            # Daily metrics, all aligned on the same DatetimeIndex
+            sleep_hours = self.sum_and_convert_to_hours(
+                self.sleep_df, "duration", "Sleep Hours"
             )
-            pivoted_health_df = self.pivot_data(
-                self.health_df,
-                ["date", "day_of_week", "month", "year"],
-                "type",
-                "value",
-            )
-            # Merging the dataframes on 'date' and other columns
-            merged_df = pivoted_activity_df.merge(
-                pivoted_health_df,
-                on=["date", "day_of_week", "month", "year"],
-                how="inner",
-            )
-
-            merged_df = merged_df.merge(
-                summed_workout_df,
-                on=["date", "day_of_week", "month", "year"],
-                how="left",
+            workout_hours = self.sum_and_convert_to_hours(
+                self.workout_df, "duration", "Workout Hours"
             )
+            pivoted_activity_df = self.pivot_data(self.activity_df, "type", "value")
+            pivoted_health_df = self.pivot_data(self.health_df, "type", "value")
 
-            merged_df = merged_df.merge(
-                summed_sleep_df, on=["date", "day_of_week", "month", "year"], how="left"
+            # Days with both activity and health data, plus workouts and sleep where present
+            merged_df = pd.concat(
+                [pivoted_activity_df, pivoted_health_df], axis=1, join="inner"
+            ).sort_index()
+            merged_df = pd.concat(
+                [
+                    merged_df,
+                    workout_hours.reindex(merged_df.index),
+                    sleep_hours.reindex(merged_df.index),
+                ],
+                axis=1,
             )
+            merged_df.columns.name = None
 
-            # Convert 'date' to datetime format
-            merged_df["date"] = pd.to_datetime(merged_df["date"])
+            # Calendar columns are derived once from the date index
+            merged_df = self.add_calendar_columns(merged_df)
             logger.info("Successfully merged all dataframes.")
 
             # Map weekdays and months
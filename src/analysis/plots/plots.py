@@ -1,5 +1,5 @@
 # src/analysis/plots/plots.py
-from src.analysis.analysis import load_dataframes, get_merged_dataframe
+from src.analysis.analysis import load_merged_dataframe
 from src.analysis.plots.plot_utils import (
     create_histogram,
     create_line_plot,
@@ -79,8 +79,7 @@ def create_plots(df):
 if __name__ == "__main__":
     try:
         # Load data
-        dataframes = load_dataframes()
-        df = get_merged_dataframe(dataframes)
+        df = load_merged_dataframe()
 
         # Print available dataframes
         #print_available_dataframes(dataframes)
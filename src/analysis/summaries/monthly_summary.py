@@ -1,8 +1,26 @@
 # src/analysis/summary/monthly_summary.py
+from src.analysis.summaries.rollup import RollupEngine
 from src.analysis.utils import MONTH_ORDER
 import pandas as pd
 
 
+def get_month_of_year_summary(df, aggregation: str, engine: RollupEngine = None):
+    """
+    Aggregates the metrics per calendar month (across years) without modifying df.
+    Months without data get NaN means and zero sums. Pass an engine to reuse its cached levels.
+    """
+    engine = engine or RollupEngine(df)
+    summary = engine.rollup("month", aggregation=aggregation, collapse_years=True)
+    summary = summary.reindex(range(1, 13))
+    if aggregation == "sum":
+        summary = summary.fillna(0)
+
+    summary.insert(
+        0, "Month", pd.Categorical(MONTH_ORDER, categories=MONTH_ORDER, ordered=True)
+    )
+    return summary.reset_index(drop=True).round(1)
+
+
 def get_monthly_mean_summary(df):
     """
     Calculate the monthly mean summary for various metrics.
@@ -30,14 +48,7 @@ def get_monthly_mean_summary(df):
     - Workout Hours: Hours (h)
     - Sleep Hours: Hours (h)
     """
-    df["Month"] = pd.Categorical(df["month"], categories=MONTH_ORDER, ordered=True)
-    df = df.drop(columns=["year"])
-    grouped_df = (
-        df.groupby("Month", observed=False).mean(numeric_only=True).reset_index()
-    )
-    grouped_df = grouped_df.round(1)
-    grouped_df = grouped_df.sort_values("Month")
-    return grouped_df
+    return get_month_of_year_summary(df, "mean")
 
 
 def get_monthly_sum_summary(df):
@@ -54,16 +65,7 @@ def get_monthly_sum_summary(df):
     - Workout Hours: Hours (h)
     - Sleep Hours: Hours (h)
     """
-    # print(df.columns())
-    df["Month"] = pd.Categorical(df["month"], categories=MONTH_ORDER, ordered=True)
-
-    # Grouping the data
-    grouped_df = (
-        df.groupby("Month", observed=False).sum(numeric_only=True).reset_index()
-    )
-
-    grouped_df = grouped_df.round(1)
-    # grouped_df = grouped_df.sort_values("Month")
+    grouped_df = get_month_of_year_summary(df, "sum")
 
     # Columns that we want to keep
     columns_to_keep = [
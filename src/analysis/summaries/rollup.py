@@ -0,0 +1,93 @@
+# src/analysis/summaries/rollup.py
+import numpy as np
+import pandas as pd
+
+from src.analysis.daily_cube import HOUR_METRICS
+from src.parsers.registry import get_aggregations
+
+LEVELS = ["day", "week", "month", "quarter", "year"]
+PERIOD_FREQUENCIES = {"day": "D", "week": "W", "month": "M", "quarter": "Q", "year": "Y"}
+# Each level is rolled up from the finer level it nests in
+PARENT_LEVELS = {"week": "day", "month": "day", "quarter": "month", "year": "quarter"}
+CALENDAR_COLUMNS = ["date", "day_of_week", "month", "year"]
+
+
+def get_metric_aggregations() -> dict:
+    """Returns the aggregation ("sum" or "mean") of every known metric, keyed by display name."""
+    aggregations = get_aggregations()
+    aggregations.update({name: "sum" for name in HOUR_METRICS.values()})
+    return aggregations
+
+
+class RollupEngine:
+    """
+    Summarises a merged daily frame per day, week, month, quarter or year.
+    Every level keeps the sum and count of each metric, so coarser levels are rolled
+    up from finer ones instead of regrouping the rows, and are cached once computed.
+    """
+
+    def __init__(self, df: pd.DataFrame, metrics: list = None):
+        # The input frame is only read, never copied or modified
+        self.df = df
+        self.metrics = metrics or [
+            column
+            for column in df.columns
+            if column not in CALENDAR_COLUMNS
+            and pd.api.types.is_numeric_dtype(df[column])
+        ]
+        self.states: dict = {}
+
+    def state(self, level: str) -> pd.DataFrame:
+        """Returns the ("sum", metric) and ("count", metric) columns of a level, indexed by period."""
+        if level in self.states:
+            return self.states[level]
+        if level not in PERIOD_FREQUENCIES:
+            raise ValueError(f"Unknown rollup level: {level}. Choose from {LEVELS}.")
+
+        if level == "day":
+            days = pd.DatetimeIndex(self.df["date"]).to_period("D")
+            values = self.df[self.metrics].to_numpy(dtype=np.float64)
+            present = ~np.isnan(values)
+            block = pd.DataFrame(
+                np.hstack([np.where(present, values, 0.0), present]),
+                columns=pd.MultiIndex.from_product([["sum", "count"], self.metrics]),
+            )
+            # A single groupby computes the sums and counts of every metric
+            state = block.groupby(days).sum()
+        else:
+            parent = self.state(PARENT_LEVELS[level])
+            periods = parent.index.asfreq(PERIOD_FREQUENCIES[level])
+            state = parent.groupby(periods).sum()
+
+        self.states[level] = state
+        return state
+
+    def rollup(
+        self, level: str = "month", aggregation: str = None, collapse_years: bool = False
+    ) -> pd.DataFrame:
+        """
+        Returns one row per period of the level and one column per metric.
+        aggregation ("sum" or "mean") applies to every metric; by default each metric uses
+        its own aggregation from the registry. With collapse_years, periods are grouped
+        by their position in the year (e.g. all Januaries together).
+        """
+        state = self.state(level)
+        if collapse_years:
+            positions = {
+                "day": state.index.dayofyear,
+                "week": state.index.week,
+                "month": state.index.month,
+                "quarter": state.index.quarter,
+                "year": np.zeros(len(state), dtype=int),
+            }[level]
+            state = state.groupby(positions).sum()
+
+        aggregations = get_metric_aggregations()
+        sums, counts = state["sum"], state["count"]
+        result = {}
+        for metric in self.metrics:
+            if (aggregation or aggregations.get(metric, "mean")) == "sum":
+                result[metric] = sums[metric]
+            else:
+                result[metric] = sums[metric] / counts[metric].where(counts[metric] > 0)
+        return pd.DataFrame(result, index=state.index)
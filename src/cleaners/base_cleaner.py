@@ -1,54 +1,323 @@
 # src/cleaners/base_cleaner.py
+import math
+import os
+import numpy as np
 import pandas as pd
 from loguru import logger
+from src.constants.paths import CLEANED_DATA_DIRECTORY
+from src.constants.dates import DEFAULT_YEARS
+from src.dates import DateFilter, date_keys, decode_apple_dates, local_datetimes
+from src.parsers.registry import get_aggregations
+from src.partitions import write_partitions
+from src.utils import (
+    find_frame_file,
+    iter_frame_batches,
+    load_frame_from_file,
+    save_csv_to_file,
+)
+
+
+def group_fsums(group_ids: np.ndarray, values: np.ndarray, groups: int) -> tuple:
+    """
+    Sums values per group id (0 to groups - 1) with math.fsum, skipping NaN and ids below 0.
+    Returns the correctly rounded sums and their rounding errors, so that sums of
+    partial sums can be merged without depending on the order they are added in.
+    """
+    keep = ~np.isnan(values)
+    group_ids, values = group_ids[keep], values[keep]
+    order = np.argsort(group_ids, kind="stable")
+    values = values[order].tolist()
+    bounds = np.searchsorted(group_ids[order], np.arange(groups + 1)).tolist()
+    sums, errors = [], []
+    for start, stop in zip(bounds[:-1], bounds[1:]):
+        group = values[start:stop]
+        total = math.fsum(group)
+        sums.append(total)
+        errors.append(math.fsum(group + [-total]))
+    return np.array(sums, dtype=np.float64), np.array(errors, dtype=np.float64)
 
 
 class BaseCleaner:
     """Base class for data cleaning."""
 
-    def __init__(self, file_path: str):
+    # Columns read from the parsed data file (None reads all of them)
+    columns: list = None
+    # Column holding the local start date of each parsed row
+    date_column: str = "date"
+    # Name of the partitioned cleaned data store (data/cleaned/<category>/)
+    category: str = None
+
+    def __init__(
+        self,
+        file_path: str = None,
+        data: pd.DataFrame = None,
+        dates: set = None,
+        date_filter: DateFilter = None,
+        batch_rows: int = None,
+    ):
         self.file_path = file_path
+        self.data = data
+        # Only these "YYYY-MM-DD" days are cleaned and replaced in the saved output
+        self.dates = dates
+        self.date_filter = date_filter or DateFilter(years=DEFAULT_YEARS)
+        # Rows per batch for cleaners that aggregate per day (None loads everything at once)
+        self.batch_rows = batch_rows
         self.df = None
+        # Rows loaded before any filtering, for the run report
+        self.records_in = 0
+
+    def load_data(self):
+        """Loads the parsed data (in-memory DataFrame, or Parquet/.npz file) into a DataFrame."""
+        if self.data is not None:
+            # Parsed data handed over in memory; project the columns into a new frame
+            columns = self.columns or list(self.data.columns)
+            self.df = self.data[[col for col in columns if col in self.data.columns]]
+        else:
+            self.df = load_frame_from_file(self.file_path, columns=self.columns)
+            if self.df is None:
+                logger.error(f"Failed data loading: {self.file_path} not found.")
+                return self.df
+        self.records_in = len(self.df)
 
-    def load_json_data(self):
-        """Loads data from a JSON file into a DataFrame."""
-        try:
-            self.df = pd.read_json(self.file_path)
+        if self.df.empty:
             return self.df
-        except FileNotFoundError:
+
+        self.df = self.filter_dates(self.df)
+        return self.df
+
+    def filter_dates(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Keeps the rows inside date_filter (and dates, if set)."""
+        # Filter on the raw column, so rows outside the window are never decoded
+        mask = self.date_filter.mask(df[self.date_column])
+        if self.dates is not None:
+            values = df[self.date_column]
+            if pd.api.types.is_datetime64_any_dtype(values):
+                # Compare days as datetimes rather than formatting every row as a string
+                days = pd.DatetimeIndex(sorted(self.dates))
+                mask &= values.dt.normalize().isin(days)
+            else:
+                mask &= date_keys(values).isin(self.dates)
+        return df[mask]
+
+    def iter_batches(self):
+        """Yields the parsed data in batches of batch_rows rows, from memory or from the file."""
+        if self.data is not None:
+            columns = self.columns or list(self.data.columns)
+            columns = [col for col in columns if col in self.data.columns]
+            for start in range(0, len(self.data), self.batch_rows):
+                yield self.data.iloc[start : start + self.batch_rows][columns]
+        else:
+            yield from iter_frame_batches(self.file_path, self.columns, self.batch_rows)
+
+    def load_grouped_by_date(self):
+        """
+        Loads the parsed data and aggregates it per day and type, like group_by_date.
+        With batch_rows the data is streamed in batches instead: each batch is reduced to
+        per-day partials (sum, count and first unit) and merged into a running aggregate,
+        so memory is bounded by the batch size and the number of days.
+        Both ways sum with math.fsum and the partials keep their rounding error, so the
+        batch boundaries do not change the result.
+        """
+        if not self.batch_rows:
+            self.df = self.load_data()
+            if self.df is None or self.df.empty:
+                return self.df
+            return self.group_by_date()
+
+        if self.data is None and find_frame_file(self.file_path) is None:
             logger.error(f"Failed data loading: {self.file_path} not found.")
+            return None
+
+        totals = None
+        types = set()
+        for batch in self.iter_batches():
+            self.records_in += len(batch)
+            self.df = self.filter_dates(batch)
+            if self.df.empty:
+                continue
+            if isinstance(self.df["type"].dtype, pd.CategoricalDtype):
+                types.update(self.df["type"].cat.categories)
+            self.df = self.decode_dates("date")
+            days = self.df["date"].dt.normalize().rename("date")
+            values = self.df["value"]
+            partial = self.merge_partials(
+                self.df.assign(date=days, type=self.df["type"].astype(object)),
+                values,
+                pd.Series(0.0, index=values.index),
+                values.notna().astype(np.int64),
+            )
+            if totals is not None:
+                # The running totals come first, so "first" still picks each day's first unit
+                merged = pd.concat([totals, partial], ignore_index=True)
+                partial = self.merge_partials(
+                    merged, merged["value_sum"], merged["value_error"], merged["value_count"]
+                )
+            totals = partial
+
+        columns = ["date", "type", "value", "unit"]
+        if totals is None:
+            self.df = pd.DataFrame(columns=columns)
+            return self.df
+
+        totals["value"] = self.aggregate_values(totals)
 
-    def filter_by_year(self, year: int = 2024):
-        """Filters the DataFrame by the specified year in the 'date' column."""
+        # Same row order and type categories as group_by_date
+        categories = sorted(types | set(totals["type"]))
+        totals["type"] = pd.Categorical(totals["type"], categories=categories)
+        self.df = totals.sort_values(["date", "type"], ignore_index=True)[columns]
+        return self.df
+
+    def save_cleaned_data(self, filename: str) -> None:
+        """
+        Saves the cleaned DataFrame as a CSV file in CLEANED_DATA_DIRECTORY, and as
+        year/month partitions under CLEANED_DATA_DIRECTORY/<category>/.
+        When only some dates were cleaned, their rows replace those in the existing file
+        and only their months are rewritten.
+        """
+        data = self.df
+        file_path = os.path.join(CLEANED_DATA_DIRECTORY, filename)
+        if self.dates is not None and os.path.isfile(file_path):
+            data = data.copy()
+            data["date"] = date_keys(pd.to_datetime(data["date"]))
+            existing = pd.read_csv(file_path)
+            existing = existing[~existing["date"].isin(self.dates)]
+            data = pd.concat([existing, data], ignore_index=True)
+            data = data.sort_values("date", kind="mergesort")
+
+        save_csv_to_file(data, CLEANED_DATA_DIRECTORY, filename)
+
+        if self.category is not None:
+            months = None if self.dates is None else {day[:7] for day in self.dates}
+            write_partitions(data, CLEANED_DATA_DIRECTORY, self.category, months)
+
+    @staticmethod
+    def map_to_categories(values: pd.Series, table: dict, fallback) -> pd.Series:
+        """
+        Maps each unique value through table, or through fallback if it is not in the table.
+        The values are factorized once, so the mapping runs per unique value rather than per row.
+        Returns a Categorical Series with the names sorted.
+        """
+        codes, uniques = pd.factorize(values)
+        names = [table[value] if value in table else fallback(value) for value in uniques]
+        categories = sorted(set(names))
+        name_codes = pd.Index(categories).get_indexer(names)
+        # Missing values keep code -1
+        codes = np.where(codes >= 0, name_codes[codes], -1)
+        return pd.Series(
+            pd.Categorical.from_codes(codes, categories=categories),
+            index=values.index,
+            name=values.name,
+        )
+
+    def decode_dates(self, *columns):
+        """
+        Parses Apple date string columns once, in place, into local datetimes.
+        The UTC offset in minutes is kept in a '<column>_offset' column.
+        Columns that are already datetimes are left as they are.
+        """
+        decoded = {}
+        for column in columns:
+            if pd.api.types.is_datetime64_any_dtype(self.df[column]):
+                continue
+            epochs, offsets = decode_apple_dates(self.df[column])
+            decoded[column] = local_datetimes(epochs, offsets)
+            decoded[f"{column}_offset"] = offsets
+
+        if decoded:
+            self.df = self.df.assign(**decoded)
+        return self.df
+
+    def utc_datetimes(self, column: str) -> pd.Series:
+        """Returns a decoded date column converted from local time to naive UTC."""
+        offsets = self.df.get(f"{column}_offset", 0)
+        return self.df[column] - pd.to_timedelta(offsets, unit="m")
+
+    def filter_by_year(self, year: int = DEFAULT_YEARS[0]):
+        """
+        Filters the DataFrame by the specified year in the 'date' column.
+        load_data already applies the cleaner's date_filter, so the cleaners don't call this.
+        """
         # Ensure the DataFrame is loaded
         if self.df is None:
             logger.error("No data loaded. Please load the data first.")
             return None
 
-        # Make sure 'date' column is in datetime format and make a copy
-        self.df = self.df.copy()
-        self.df.loc[:, "date"] = pd.to_datetime(self.df["date"])
+        # Make sure 'date' column is in datetime format
+        self.df = self.decode_dates("date")
 
         # Filter for the specified year
         self.df = self.df[self.df["date"].dt.year == year]
 
         return self.df
 
-    def group_by_date(self, agg_type: str):
-        """Groups the DataFrame by the 'date' column."""
-        self.df["date"] = pd.to_datetime(self.df["date"])
-        self.df["just_date"] = self.df["date"].dt.date
+    def group_by_date(self):
+        """
+        Groups the DataFrame by day and type, summing or averaging each type's values
+        as its aggregation in the registry (src/parsers/registry.py) says.
+        """
+        self.df = self.decode_dates("date")
+        just_date = self.df["date"].dt.normalize().rename("just_date")
+        types = self.df["type"]
+        # Categorical groups follow the category order, so sort it to keep the rows
+        # of each day in alphabetical type order
+        if isinstance(types.dtype, pd.CategoricalDtype):
+            types = types.cat.reorder_categories(sorted(types.cat.categories))
 
+        groups = self.df.groupby([just_date, types], observed=True)
         df_grouped = (
-            self.df.groupby(["just_date", "type"])
-            .agg(
-                {"value": agg_type, "unit": "first"}
-            )  # Aggregate the data by aggregation type
+            groups.agg(value_count=("value", "count"), unit=("unit", "first"))
             .reset_index()
         )
+        # Correctly rounded sums, which the batched path reproduces exactly
+        values = self.df["value"].to_numpy(dtype=np.float64)
+        df_grouped["value_sum"] = group_fsums(
+            groups.ngroup().to_numpy(), values, len(df_grouped)
+        )[0]
         df_grouped.rename(columns={"just_date": "date"}, inplace=True)
+        df_grouped["value"] = self.aggregate_values(df_grouped)
+
+        return df_grouped[["date", "type", "value", "unit"]]
+
+    @staticmethod
+    def merge_partials(
+        df: pd.DataFrame, sums: pd.Series, errors: pd.Series, counts: pd.Series
+    ) -> pd.DataFrame:
+        """
+        Reduces the rows of df to one per day and type: the fsum of sums and errors
+        (as value_sum and its rounding error value_error), the sum of counts and the
+        first unit.
+        """
+        groups = df.groupby(["date", "type"], sort=False)
+        merged = groups.agg(unit=("unit", "first")).reset_index()
+        # Rows without a date have no group (-1)
+        ids = groups.ngroup().to_numpy()
+        grouped = ids >= 0
+        counts = np.bincount(ids[grouped], counts.to_numpy()[grouped], len(merged))
+        merged["value_count"] = counts.astype(np.int64)
+        merged["value_sum"], merged["value_error"] = group_fsums(
+            np.concatenate([ids, ids]),
+            np.concatenate([sums.to_numpy(np.float64), errors.to_numpy(np.float64)]),
+            len(merged),
+        )
+        return merged
 
-        return df_grouped
+    @staticmethod
+    def aggregate_values(grouped: pd.DataFrame) -> pd.Series:
+        """
+        Returns the daily value of each (day, type) group from its value_sum and value_count:
+        the sum for "sum" metrics, the mean for "mean" metrics.
+        Types missing from the registry are averaged, with a warning.
+        """
+        aggregations = get_aggregations()
+        types = grouped["type"].astype(object)
+        unknown = set(types.unique()) - set(aggregations)
+        if unknown:
+            logger.warning(
+                f"Types missing from the registry are averaged per day: {sorted(unknown)}"
+            )
+        summed = types.map(aggregations).eq("sum").to_numpy()
+        means = grouped["value_sum"] / grouped["value_count"].where(grouped["value_count"] > 0)
+        return grouped["value_sum"].where(summed, means)
 
     def split_datetime_columns(self):
         """Splits a 'date' column into 'year', 'month', 'day', and 'day_of_week' columns."""
@@ -56,7 +325,7 @@ class BaseCleaner:
             logger.error('The DataFrame must contain a "date" column.')
             raise ValueError('The DataFrame must contain a "date" column.')
 
-        self.df["date"] = pd.to_datetime(self.df["date"])  # Convert to datetime
+        self.df = self.decode_dates("date")  # Convert to datetime
 
         # Split 'date' into 'year', 'month', 'day', and 'day_of_week'
         self.df["year"] = self.df["date"].dt.year
@@ -1,15 +1,14 @@
 # src/cleaners/sleep_cleaner.py
 import re
 from loguru import logger
-import pandas as pd
 from src.cleaners.base_cleaner import BaseCleaner
-from src.constants.paths import CLEANED_DATA_DIRECTORY
-from src.utils import save_csv_to_file
+from src.constants.sleep import SLEEP_TYPE_NAMES
 
 
 class SleepCleaner(BaseCleaner):
-    def __init__(self, file_path: str):
-        super().__init__(file_path)
+    category = "sleep"
+    columns = ["start_time", "end_time", "value"]
+    date_column = "start_time"
 
     @staticmethod
     def fetch_sleep_type(value: str):
@@ -20,8 +19,8 @@ class SleepCleaner(BaseCleaner):
 
     def extract_date(self):
         """Extracts the date from the 'start_time' column."""
-        self.df["date"] = self.df["start_time"].dt.date
-        self.df["date"] = pd.to_datetime(self.df["date"])
+        self.df = self.decode_dates("start_time", "end_time")
+        self.df["date"] = self.df["start_time"].dt.normalize()
         return self.df
 
     def format_time_columns(self):
@@ -32,32 +31,32 @@ class SleepCleaner(BaseCleaner):
 
     def calculate_sleep_duration(self):
         # Ensure datetime values
-        self.df["start_time"] = pd.to_datetime(self.df["start_time"])
-        self.df["end_time"] = pd.to_datetime(self.df["end_time"])
-        self.df["duration"] = (
-            self.df["end_time"] - self.df["start_time"]
-        ).dt.total_seconds() / 60
+        self.df = self.decode_dates("start_time", "end_time")
+        # Subtract in UTC so sleep spanning a DST change or time zone move is correct
+        duration = self.utc_datetimes("end_time") - self.utc_datetimes("start_time")
+        self.df["duration"] = duration.dt.total_seconds() / 60
         return self.df
 
     def clean_data(self):
         """Orchestrates the data cleaning process."""
-        logger.info("Loading JSON data for cleaning.")
-        self.df = self.load_json_data()
+        logger.info("Loading parsed data for cleaning.")
+        self.df = self.load_data()
 
         if self.df is not None:
             logger.info("Cleaning sleep data.")
 
             if self.df is not None and not self.df.empty:
                 # Extract sleep type from 'value' column
-                self.df["sleep_type"] = self.df["value"].apply(self.fetch_sleep_type)
+                self.df["sleep_type"] = self.map_to_categories(
+                    self.df["value"], SLEEP_TYPE_NAMES, self.fetch_sleep_type
+                )
                 self.df = self.extract_date()
-                self.df = self.filter_by_year()
                 self.df = self.calculate_sleep_duration()
                 self.df = self.format_time_columns()
                 # Group by date and sleep_type, summing up the duration for each group
                 # Group by date and sleep_type, but keep the first start_time and last end_time for each group
                 grouped = (
-                    self.df.groupby(["date", "sleep_type"])
+                    self.df.groupby(["date", "sleep_type"], observed=True)
                     .agg(
                         duration=("duration", "sum"),
                         start_time=("start_time", "min"),  # Earliest start time
@@ -70,9 +69,7 @@ class SleepCleaner(BaseCleaner):
                 self.df = self.reorder_datetime_columns()
 
                 # Save the cleaned DataFrame to a CSV file
-                save_csv_to_file(
-                    self.df, CLEANED_DATA_DIRECTORY, "cleaned_sleep_data.csv"
-                )
+                self.save_cleaned_data("cleaned_sleep_data.csv")
         else:
             logger.error("Failed to load data.")
 
@@ -3,13 +3,23 @@ import re
 import pandas as pd
 from loguru import logger
 from src.cleaners.base_cleaner import BaseCleaner
-from src.constants.paths import CLEANED_DATA_DIRECTORY
-from src.utils import save_csv_to_file
+from src.constants.workout import WORKOUT_TYPE_NAMES
 
 
 class WorkoutCleaner(BaseCleaner):
-    def __init__(self, file_path: str):
-        super().__init__(file_path)
+    category = "workout"
+    columns = [
+        "date",
+        "duration",
+        "workout_type",
+        "energy_burned",
+        "distance",
+        "distance_unit",
+        "average_heart_rate",
+        "max_heart_rate",
+        "event_count",
+        "indoor",
+    ]
 
     @staticmethod
     def fetch_activity_type(workout_type: str):
@@ -27,7 +37,8 @@ class WorkoutCleaner(BaseCleaner):
             )
 
         # Convert 'date' column to datetime
-        self.df["start_time"] = pd.to_datetime(self.df["date"])
+        self.df = self.decode_dates("date")
+        self.df["start_time"] = self.df["date"]
 
         # Calculate end_time by adding the duration in minutes
         self.df["end_time"] = self.df["start_time"] + pd.to_timedelta(
@@ -42,16 +53,15 @@ class WorkoutCleaner(BaseCleaner):
 
     def clean_data(self):
         """Orchestrates the data cleaning process."""
-        logger.info("Loading JSON data for cleaning.")
-        self.df = self.load_json_data()
-        if self.df is not None:
+        logger.info("Loading parsed data for cleaning.")
+        self.df = self.load_data()
+        if self.df is not None and not self.df.empty:
             logger.info("Cleaning workout data.")
 
 
-            self.df = self.filter_by_year()
             # Extract workout types
-            self.df["workout_type"] = self.df["workout_type"].apply(
-                self.fetch_activity_type
+            self.df["workout_type"] = self.map_to_categories(
+                self.df["workout_type"], WORKOUT_TYPE_NAMES, self.fetch_activity_type
             )
             # Calculate start and end times after the 'date' column is properly formatted
             self.df = self.calculate_start_end_times()
@@ -59,6 +69,10 @@ class WorkoutCleaner(BaseCleaner):
             self.df = self.split_datetime_columns()
             self.df = self.reorder_datetime_columns()
             self.df = self.round_column_values(column="duration")
+            # Parsed files written before workout statistics were extracted lack these columns
+            self.df = self.df.reindex(columns=self.df.columns.union(self.columns, sort=False))
+            for column in ["energy_burned", "distance", "average_heart_rate"]:
+                self.df = self.round_column_values(column=column)
             # Drop workouts that have a duration of less than 5 minutes and convert to int
             self.df = self.df[self.df["duration"] >= 5]
             # Format "date" column as YYYY-MM-DD
@@ -74,10 +88,17 @@ class WorkoutCleaner(BaseCleaner):
                 "start_time",
                 "end_time",
                 "duration",
+                "energy_burned",
+                "distance",
+                "distance_unit",
+                "average_heart_rate",
+                "max_heart_rate",
+                "event_count",
+                "indoor",
             ]
             self.df = self.df[column_order]
 
             # Save to CSV file
-            save_csv_to_file(self.df, CLEANED_DATA_DIRECTORY, "cleaned_workout_data.csv")
+            self.save_cleaned_data("cleaned_workout_data.csv")
 
         return self.df
\ No newline at end of file
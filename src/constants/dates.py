@@ -0,0 +1,3 @@
+# src/constants/dates.py
+# Years analysed when no other date window is configured
+DEFAULT_YEARS = [2024]
@@ -0,0 +1,15 @@
+# src/constants/export.py
+# Attribute that identifies the kind of each element in export.xml.
+# Apple writes it as the first attribute of the element.
+ROUTING_ATTRIBUTES = {
+    "Record": "type",
+    "Workout": "workoutActivityType",
+}
+
+# Column holding the local start date in each parsed data category
+PARSED_DATE_COLUMNS = {
+    "health": "date",
+    "activity": "date",
+    "sleep": "start_time",
+    "workout": "date",
+}
@@ -1,5 +1,6 @@
 # src/constants/health.py
 HK_RESTING_HEARTRATE = "HKQuantityTypeIdentifierRestingHeartRate"
+HK_HEARTRATE = "HKQuantityTypeIdentifierHeartRate"
 HK_VO2_MAX = "HKQuantityTypeIdentifierVO2Max"
 HK_HEARTRATE_RECOVERY = "HKQuantityTypeIdentifierHeartRateRecoveryOneMinute"
 HK_WALKING_STEP_LENGTH = "HKQuantityTypeIdentifierWalkingStepLength"
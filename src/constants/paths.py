@@ -2,10 +2,23 @@
 ZIP_FILE_PATH = "data/raw/export.zip"
 EXTRACTION_PATH = "data/raw/"
 XML_FILE_PATH = "data/raw/apple_health_export/export.xml"
+EXPORT_XML_MEMBER = "apple_health_export/export.xml"
 PARSED_DATA_DIRECTORY = "data/processed/"
-PARSED_ACTIVITY_DATA_PATH = f"{PARSED_DATA_DIRECTORY}activity_data.json"
-PARSED_HEALTH_DATA_PATH = f"{PARSED_DATA_DIRECTORY}health_data.json"
-PARSED_SLEEP_DATA_PATH = f"{PARSED_DATA_DIRECTORY}sleep_data.json"
-PARSED_WORKOUT_DATA_PATH = f"{PARSED_DATA_DIRECTORY}workout_data.json"
+# Parsed data paths are given without extension (.parquet or .npz)
+PARSED_ACTIVITY_DATA_PATH = f"{PARSED_DATA_DIRECTORY}activity_data"
+PARSED_HEALTH_DATA_PATH = f"{PARSED_DATA_DIRECTORY}health_data"
+PARSED_SLEEP_DATA_PATH = f"{PARSED_DATA_DIRECTORY}sleep_data"
+PARSED_WORKOUT_DATA_PATH = f"{PARSED_DATA_DIRECTORY}workout_data"
+# High-water marks and pending dates for incremental ingestion
+INGEST_STATE_PATH = f"{PARSED_DATA_DIRECTORY}ingest_state.json"
 CLEANED_DATA_DIRECTORY = "data/cleaned/"
+# Parsed data of recent exports, keyed on the export hash
+PARSE_CACHE_DIRECTORY = "data/cache/parsed/"
+PARSE_CACHE_MAX_BYTES = 2 * 1024**3
+# Memory-mapped matrix of daily metrics built from the cleaned partitions
+DAILY_CUBE_DIRECTORY = "data/cube/"
+# Chunked, memory-mapped heart-rate samples
+HEART_RATE_DIRECTORY = "data/heart_rate/"
+# JSON run reports and optional cProfile/tracemalloc dumps
+RUN_REPORT_DIRECTORY = "data/reports/"
 PLOT_EXAMPLES_PATH = "src/analysis/plots/examples/"
@@ -4,3 +4,9 @@ HK_RECORD_SLEEP_ANALYSIS_ASLEEP_DEEP = "HKCategoryValueSleepAnalysisAsleepDeep"
 HK_RECORD_SLEEP_ANALYSIS_ASLEEP_CORE = "HKCategoryValueSleepAnalysisAsleepCore"
 HK_RECORD_SLEEP_ANALYSIS_ASLEEP_REM = "HKCategoryValueSleepAnalysisAsleepREM" 
 SLEEP_CATEGORIES = [HK_RECORD_SLEEP_ANALYSIS_ASLEEP_DEEP, HK_RECORD_SLEEP_ANALYSIS_ASLEEP_CORE, HK_RECORD_SLEEP_ANALYSIS_ASLEEP_REM]
+# Sleep category value -> sleep type name used in the cleaned data
+SLEEP_TYPE_NAMES = {
+    HK_RECORD_SLEEP_ANALYSIS_ASLEEP_DEEP: "Deep",
+    HK_RECORD_SLEEP_ANALYSIS_ASLEEP_CORE: "Core",
+    HK_RECORD_SLEEP_ANALYSIS_ASLEEP_REM: "REM",
+}
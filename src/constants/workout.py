@@ -65,4 +65,95 @@ HK_WORKOUT_WATER_FITNESS = "HKWorkoutActivityTypeWaterFitness"
 HK_WORKOUT_WATER_POLO = "HKWorkoutActivityTypeWaterPolo"
 HK_WORKOUT_WATER_SPORTS = "HKWorkoutActivityTypeWaterSports"
 HK_WORKOUT_WRESTLING = "HKWorkoutActivityTypeWrestling"
-HK_WORKOUT_YOGA = "HKWorkoutActivityTypeYoga"
\ No newline at end of file
+HK_WORKOUT_YOGA = "HKWorkoutActivityTypeYoga"
+
+WORKOUT_ACTIVITY_TYPES = (
+    HK_WORKOUT_AMERICAN_FOOTBALL,
+    HK_WORKOUT_ARCHERY,
+    HK_WORKOUT_AUSTRALIAN_FOOTBALL,
+    HK_WORKOUT_BADMINTON,
+    HK_WORKOUT_BASEBALL,
+    HK_WORKOUT_BASKETBALL,
+    HK_WORKOUT_BOWLING,
+    HK_WORKOUT_BOXING,
+    HK_WORKOUT_CLIMBING,
+    HK_WORKOUT_CRICKET,
+    HK_WORKOUT_CROSS_TRAINING,
+    HK_WORKOUT_CURLING,
+    HK_WORKOUT_CYCLING,
+    HK_WORKOUT_DANCE,
+    HK_WORKOUT_DANCE_INSPIRED_TRAINING,
+    HK_WORKOUT_ELLIPTICAL,
+    HK_WORKOUT_EQUESTRIAN_SPORTS,
+    HK_WORKOUT_FENCING,
+    HK_WORKOUT_FISHING,
+    HK_WORKOUT_FUNCTIONAL_STRENGTH_TRAINING,
+    HK_WORKOUT_GOLF,
+    HK_WORKOUT_GYMNASTICS,
+    HK_WORKOUT_HANDBALL,
+    HK_WORKOUT_HIGH_INTENSITY_INTERVAL_TRAINING,
+    HK_WORKOUT_HIKING,
+    HK_WORKOUT_HOCKEY,
+    HK_WORKOUT_HUNTING,
+    HK_WORKOUT_LACROSSE,
+    HK_WORKOUT_MARTIAL_ARTS,
+    HK_WORKOUT_MIND_AND_BODY,
+    HK_WORKOUT_MIXED_METABOLIC_CARDIO_TRAINING,
+    HK_WORKOUT_OTHER,
+    HK_WORKOUT_PADDLE_SPORTS,
+    HK_WORKOUT_PLAY,
+    HK_WORKOUT_PREPARATION_AND_RECOVERY,
+    HK_WORKOUT_RACQUETBALL,
+    HK_WORKOUT_ROWING,
+    HK_WORKOUT_RUGBY,
+    HK_WORKOUT_RUNNING,
+    HK_WORKOUT_SAILING,
+    HK_WORKOUT_SKATING_SPORTS,
+    HK_WORKOUT_SNOW_SPORTS,
+    HK_WORKOUT_SOCCER,
+    HK_WORKOUT_SOFTBALL,
+    HK_WORKOUT_SQUASH,
+    HK_WORKOUT_STAIR_CLIMBING,
+    HK_WORKOUT_SURFING_SPORTS,
+    HK_WORKOUT_SWIMMING,
+    HK_WORKOUT_TABLE_TENNIS,
+    HK_WORKOUT_TENNIS,
+    HK_WORKOUT_TRACK_AND_FIELD,
+    HK_WORKOUT_TRADITIONAL_STRENGTH_TRAINING,
+    HK_WORKOUT_VOLLEYBALL,
+    HK_WORKOUT_WALKING,
+    HK_WORKOUT_WATER_FITNESS,
+    HK_WORKOUT_WATER_POLO,
+    HK_WORKOUT_WATER_SPORTS,
+    HK_WORKOUT_WRESTLING,
+    HK_WORKOUT_YOGA,
+)
+
+WORKOUT_ACTIVITY_TYPE_PREFIX = "HKWorkoutActivityType"
+# Workout activity type -> workout type name used in the cleaned data, e.g. "Running"
+WORKOUT_TYPE_NAMES = {
+    value: value[len(WORKOUT_ACTIVITY_TYPE_PREFIX) :] for value in WORKOUT_ACTIVITY_TYPES
+}
+
+# Nested elements of a Workout in export.xml
+HK_WORKOUT_STATISTICS = "WorkoutStatistics"
+HK_WORKOUT_EVENT = "WorkoutEvent"
+HK_METADATA_ENTRY = "MetadataEntry"
+HK_METADATA_INDOOR_WORKOUT = "HKIndoorWorkout"
+
+# WorkoutStatistics type -> (parsed column, statistic attribute) pairs
+WORKOUT_STATISTICS = {
+    "HKQuantityTypeIdentifierActiveEnergyBurned": [("energy_burned", "sum")],
+    "HKQuantityTypeIdentifierDistanceWalkingRunning": [("distance", "sum")],
+    "HKQuantityTypeIdentifierDistanceCycling": [("distance", "sum")],
+    "HKQuantityTypeIdentifierDistanceSwimming": [("distance", "sum")],
+    "HKQuantityTypeIdentifierHeartRate": [
+        ("average_heart_rate", "average"),
+        ("max_heart_rate", "maximum"),
+    ],
+}
+# Workout attributes used by older exports without WorkoutStatistics
+WORKOUT_TOTAL_ATTRIBUTES = {
+    "energy_burned": "totalEnergyBurned",
+    "distance": "totalDistance",
+}
@@ -1,6 +1,7 @@
 # src/data_cleaning.py
 import time
 import os
+from concurrent.futures import ProcessPoolExecutor
 from loguru import logger
 from src.constants.paths import CLEANED_DATA_DIRECTORY
 from src.constants.paths import (
@@ -13,36 +14,146 @@ from src.cleaners.workout_cleaner import WorkoutCleaner
 from src.cleaners.health_cleaner import HealthCleaner
 from src.cleaners.activity_cleaner import ActivityCleaner
 from src.cleaners.sleep_cleaner import SleepCleaner
+from src.dates import DateFilter
+from src.ingest_state import IngestState
+from src.profiling import RunProfiler
+from src.utils import find_frame_file, frame_file_paths
 
+# Data category -> cleaner class and parsed data path
+CLEANERS = {
+    "workout": (WorkoutCleaner, PARSED_WORKOUT_DATA_PATH),
+    "health": (HealthCleaner, PARSED_HEALTH_DATA_PATH),
+    "activity": (ActivityCleaner, PARSED_ACTIVITY_DATA_PATH),
+    "sleep": (SleepCleaner, PARSED_SLEEP_DATA_PATH),
+}
 
-def clean_all_data() -> dict:
+
+def run_cleaner(
+    category: str, cleaner_class, options: dict, profiler: RunProfiler
+) -> tuple:
+    """
+    Runs one cleaner, isolating its errors from the other categories.
+    Returns the cleaned DataFrame and whether cleaning succeeded.
+    """
+    try:
+        with profiler.stage(f"clean_{category}") as metrics:
+            cleaner = cleaner_class(**options)
+            cleaned = cleaner.clean_data()
+            metrics["records_in"] = cleaner.records_in
+            metrics["records_out"] = 0 if cleaned is None else len(cleaned)
+            # In-memory data is handed over without reading from disk
+            if cleaner.file_path is None:
+                metrics["bytes_read"] = 0
+            else:
+                metrics["bytes_read"] = sum(
+                    os.path.getsize(file_path)
+                    for file_path in frame_file_paths(cleaner.file_path)
+                )
+    except Exception as e:
+        logger.exception(f"Failed to clean {category} data: {e}")
+        return None, False
+    return cleaned, True
+
+
+def run_cleaner_in_worker(
+    category: str, cleaner_class, options: dict, run_id: str, directory: str
+) -> tuple:
+    """Runs a cleaner in a pool worker, also returning the stage metrics of its own profiler."""
+    profiler = RunProfiler(run_id=run_id, directory=directory)
+    cleaned, succeeded = run_cleaner(category, cleaner_class, options, profiler)
+    return cleaned, succeeded, profiler.stages
+
+
+def clean_all_data(
+    data: dict = None,
+    incremental: bool = False,
+    date_filter: DateFilter = None,
+    profiler: RunProfiler = None,
+    batch_rows: int = None,
+    workers: int = 1,
+) -> dict:
+    """
+    Cleans all data categories and returns the cleaned DataFrames.
+    If data (as returned by parse_all_data) is given, the parsed DataFrames are
+    cleaned in memory; otherwise they are loaded from the parsed data files.
+    With incremental=True only the dates queued by parse_all_data(incremental=True)
+    are cleaned from the parsed data files and replaced in the cleaned CSV files.
+    Only rows inside date_filter are cleaned, by default the years in DEFAULT_YEARS.
+    Stage metrics are recorded in profiler, if given, for the run report.
+    With batch_rows, health and activity data are cleaned in batches of that many rows,
+    so their memory use no longer grows with the size of the export.
+    With workers > 1 the categories are cleaned concurrently in a process pool.
+    A category whose cleaner fails is logged and left out of the result.
+    """
     logger.info("Cleaning all data.")
     start_time = time.time()
+    cleaned = {}
+    profiler = profiler or RunProfiler()
 
     if not os.path.exists(CLEANED_DATA_DIRECTORY):
         os.makedirs(CLEANED_DATA_DIRECTORY)
 
-    # Workout data
-    if os.path.exists(PARSED_WORKOUT_DATA_PATH):
-        print(PARSED_WORKOUT_DATA_PATH)
-        cleaner = WorkoutCleaner(PARSED_WORKOUT_DATA_PATH)
-        cleaner.clean_data()
+    state = IngestState.load() if incremental else None
 
-    # Health data
-    if os.path.exists(PARSED_HEALTH_DATA_PATH):
-        cleaner = HealthCleaner(PARSED_HEALTH_DATA_PATH)
-        cleaner.clean_data()
+    # Category -> cleaner class and its arguments
+    tasks = {}
+    for category, (cleaner_class, parsed_data_path) in CLEANERS.items():
+        options = {"date_filter": date_filter, "batch_rows": batch_rows}
+        if incremental:
+            # New rows were appended to the parsed data files, so clean from there
+            dates = state.pending_dates.get(category)
+            if not dates or not find_frame_file(parsed_data_path):
+                continue
+            logger.info(f"Cleaning {len(dates)} changed dates of {category} data.")
+            options.update(file_path=parsed_data_path, dates=dates)
+        elif data is not None and category in data:
+            options.update(data=data[category])
+        elif find_frame_file(parsed_data_path):
+            options.update(file_path=parsed_data_path)
+        else:
+            continue
+        tasks[category] = (cleaner_class, options)
 
-    # Activity data
-    if os.path.exists(PARSED_ACTIVITY_DATA_PATH):
-        cleaner = ActivityCleaner(PARSED_ACTIVITY_DATA_PATH)
-        cleaner.clean_data()
+    def finish(category: str, cleaned_df, succeeded: bool) -> None:
+        if not succeeded:
+            return
+        cleaned[category] = cleaned_df
+        if incremental:
+            # Checkpoint per category so an interrupted run resumes where it stopped
+            del state.pending_dates[category]
+            state.save()
 
-    # Sleep data
-    if os.path.exists(PARSED_SLEEP_DATA_PATH):
-        cleaner = SleepCleaner(PARSED_SLEEP_DATA_PATH)
-        cleaner.clean_data()
+    if workers > 1 and len(tasks) > 1:
+        logger.info(f"Cleaning {len(tasks)} categories with {workers} workers.")
+        with profiler.stage("clean_pool", workers=workers):
+            with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as executor:
+                futures = {
+                    category: executor.submit(
+                        run_cleaner_in_worker,
+                        category,
+                        cleaner_class,
+                        options,
+                        profiler.run_id,
+                        profiler.directory,
+                    )
+                    for category, (cleaner_class, options) in tasks.items()
+                }
+                # Results are collected in CLEANERS order, whichever finishes first
+                for category, future in futures.items():
+                    try:
+                        cleaned_df, succeeded, stages = future.result()
+                    except Exception as e:
+                        # e.g. the worker process died or the result could not be pickled
+                        logger.error(f"Cleaning {category} data in a worker failed: {e}")
+                        continue
+                    profiler.stages.extend(stages)
+                    finish(category, cleaned_df, succeeded)
+    else:
+        for category, (cleaner_class, options) in tasks.items():
+            finish(category, *run_cleaner(category, cleaner_class, options, profiler))
 
     end_time = time.time()
     duration = end_time - start_time
     logger.info(f"Cleaning complete in {duration:.2f} seconds.")
+
+    return cleaned
@@ -1,10 +1,10 @@
 # src/data_loading.py
-import xml.etree.ElementTree as ET
 import zipfile
+from contextlib import contextmanager
 
 from loguru import logger
 
-from .constants.paths import EXTRACTION_PATH, ZIP_FILE_PATH
+from .constants.paths import EXPORT_XML_MEMBER, EXTRACTION_PATH, ZIP_FILE_PATH
 
 
 def unzip_export(
@@ -21,3 +21,31 @@ def unzip_export(
         logger.error(f"Failed to extract: {zip_file} not found.")
     except Exception as e:
         logger.error(f"An unexpected error occurred while extracting {zip_file}: {e}")
+
+
+@contextmanager
+def open_export_xml(source: str = ZIP_FILE_PATH, member: str = EXPORT_XML_MEMBER):
+    """
+    Opens export.xml as a binary stream.
+    If source is an export.zip archive, the member is streamed out of it without extraction.
+    """
+    if not zipfile.is_zipfile(source):
+        with open(source, "rb") as xml_file:
+            yield xml_file
+        return
+
+    with zipfile.ZipFile(source, "r") as zip_ref:
+        try:
+            info = zip_ref.getinfo(member)
+        except KeyError:
+            # Fall back to any export.xml in the archive, e.g. a renamed export folder
+            candidates = [
+                name for name in zip_ref.namelist() if name.endswith("/export.xml")
+            ]
+            if not candidates:
+                raise FileNotFoundError(f"{member} not found in {source}")
+            info = zip_ref.getinfo(candidates[0])
+
+        logger.info(f"Streaming {info.filename} from {source}.")
+        with zip_ref.open(info) as xml_file:
+            yield xml_file
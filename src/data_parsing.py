@@ -1,104 +1,222 @@
 # src/data_parsing.py
 import os
 import time
+import zipfile
 
 from loguru import logger
 
+from src.constants.export import PARSED_DATE_COLUMNS
 from src.constants.paths import PARSED_DATA_DIRECTORY, XML_FILE_PATH
+from src.dates import DateFilter, date_keys
+from src.heart_rate_store import HeartRateStore
+from src.ingest_state import IngestState
+from src.parse_cache import ParseCache, cache_key
 from src.parsers.sleep_parsers import SleepDataParser
-from src.parsers.health_parsers import (
-    RestingHeartRateParser,
-    Vo2MaxParser,
-    HeartrateRecoveryParser,
-    WalkingStepLengthParser,
-    RespiratoryRateParser,
-    WalkingSpeedParser,
-    StairAscentSpeedParser,
-    WalkingHeartrateParser,
-    RunningStrideLengthParser,
-    RunningGroundContactTimeParsers,
-    RunningVerticalOscillationParser,
-    RunningSpeedParser,
-    RunningPowerParser,
-)
-from src.parsers.activity_parsers import (
-    ExerciseTimeParser,
-    EnergyBurnedParser,
-    StepCountParser,
-    FlightsClimbedParser,
-    PhysicalEffortParser,
-)
+from src.parsers.health_parsers import HealthRecordParser, HeartRateParser
+from src.parsers.activity_parsers import ActivityRecordParser
 from src.parsers.workout_parser import WorkoutDataParser
-from .utils import save_json_to_file
+from src.parsers.dispatcher import ParserDispatcher, raise_for_failed_parsers
+from src.parsers.parallel import parse_in_parallel
+from src.profiling import RunProfiler
+from .data_loading import open_export_xml
+from .utils import append_frame_to_file, records_to_dataframe, save_frame_to_file
 
 
-def parse_all_data() -> dict:
-    """Parses all health data from XML files using various data parsers and saves the parsed data as JSON files."""
+def parse_all_data(
+    file_path: str = XML_FILE_PATH,
+    workers: int = 1,
+    backend: str = None,
+    persist: bool = True,
+    incremental: bool = False,
+    use_cache: bool = True,
+    date_filter: DateFilter = None,
+    heart_rate: bool = False,
+    profiler: RunProfiler = None,
+) -> dict:
+    """
+    Parses all health data from XML files using various data parsers and saves the parsed data as Parquet (or .npz) files.
+    Returns a DataFrame per data category, which can be passed straight to clean_all_data.
+    With persist=False the parsed data is only returned, not written to disk.
+    file_path may be export.xml or export.zip; the latter is streamed without extraction.
+    With workers > 1 the XML file is split into byte ranges parsed by a process pool.
+    backend selects the XML backend ("stdlib", "lxml" or "scanner"), defaulting to stdlib.
+    With incremental=True only records created after the last incremental run are parsed;
+    they are appended to the parsed data files, their dates are queued for
+    clean_all_data(incremental=True), and only the new rows are returned.
+    Unless use_cache=False, the parsed data is cached per export and registry version,
+    so parsing the same export again just loads the cached files.
+    With a date_filter, records whose startDate is outside the window are skipped
+    before they reach the parsers.
+    If a parser fails on an element, ParserFailedError is raised before anything is
+    saved, so no partial data is persisted, cached or checkpointed.
+    With heart_rate=True the full heart-rate series is parsed in the same pass and
+    stored in a HeartRateStore (appended to in incremental mode).
+    Stage metrics are recorded in profiler, if given, for the run report.
+    """
     logger.info("Parsing all data...")
     start_time = time.time()
     total_records = 0
     data = {}
+    profiler = profiler or RunProfiler()
 
     if not os.path.exists(PARSED_DATA_DIRECTORY):
         os.makedirs(PARSED_DATA_DIRECTORY)
 
     # Group parsers into respective data categories
     parsers = {
-        "health": [
-            RestingHeartRateParser,
-            Vo2MaxParser,
-            HeartrateRecoveryParser,
-            WalkingStepLengthParser,
-            RespiratoryRateParser,
-            WalkingSpeedParser,
-            StairAscentSpeedParser,
-            WalkingHeartrateParser,
-            RunningStrideLengthParser,
-            RunningGroundContactTimeParsers,
-            RunningVerticalOscillationParser,
-            RunningSpeedParser,
-            RunningPowerParser,
-        ],
+        "health": [HealthRecordParser],
         "sleep": [SleepDataParser],
-        "activity": [
-            EnergyBurnedParser,
-            ExerciseTimeParser,
-            PhysicalEffortParser,
-            StepCountParser,
-            FlightsClimbedParser,
-        ],
+        "activity": [ActivityRecordParser],
         "workout": [WorkoutDataParser],
     }
 
-    # Process each category of data
-    for category, parser_classes in parsers.items():
-        category_data = []
-        logger.info(f"Started parsing category: {category}")
-
-        for parser_class in parser_classes:
-            try:
-                parser_start_time = time.time()  # Start timer for the specific parser
-                parser = parser_class(XML_FILE_PATH)
-                parsed_data = parser.parse()
-                category_data.extend(
-                    parsed_data
-                )  # Combine all data from parsers in the same category
-                parser_duration = (
-                    time.time() - parser_start_time
-                )  # Calculate the parser's duration
+    if not os.path.exists(file_path):
+        logger.error(f"File not found: {file_path}")
+        return data
+
+    state = None
+    high_water_marks = None
+    append = False
+    if incremental:
+        if not persist:
+            logger.warning("Incremental parsing always saves the parsed data.")
+            persist = True
+        state = IngestState.load()
+        # Without a checkpoint everything is parsed and the parsed data files are replaced
+        high_water_marks = state.high_water_marks
+        append = bool(high_water_marks)
+        logger.info(
+            f"Incremental parsing with {len(high_water_marks)} high-water marks."
+        )
+
+    cache = None
+    if use_cache and not incremental:
+        cache = ParseCache()
+        key = cache_key(file_path, date_filter)
+        with profiler.stage("load_cache") as metrics:
+            cached = cache.load(key)
+            metrics["hit"] = cached is not None
+        # The heart-rate series is not cached, only reused if it came from this export
+        if heart_rate and HeartRateStore().source != key:
+            cached = None
+        if cached is not None:
+            logger.info(f"Parse cache hit for {file_path}, skipping parsing.")
+            if persist:
+                for category, category_df in cached.items():
+                    save_frame_to_file(
+                        category_df, PARSED_DATA_DIRECTORY, f"{category}_data"
+                    )
+            return cached
+
+    if workers > 1 and zipfile.is_zipfile(file_path):
+        # Byte ranges need random access, which a compressed zip member lacks
+        logger.warning("Parallel parsing requires an extracted export.xml, parsing serially.")
+        workers = 1
+
+    # Instantiate every parser and walk the XML file once for all of them
+    instances = {
+        category: [parser_class(file_path) for parser_class in parser_classes]
+        for category, parser_classes in parsers.items()
+    }
+    all_parsers = [
+        parser for category_parsers in instances.values() for parser in category_parsers
+    ]
+    heart_rate_parser = HeartRateParser(file_path) if heart_rate else None
+    if heart_rate_parser is not None:
+        all_parsers.append(heart_rate_parser)
+    with profiler.stage("parse", backend=backend, workers=workers) as metrics:
+        # Per-parser timing costs two clock reads per element, so it is opt-in
+        timings = {} if profiler.detailed else None
+        if workers > 1:
+            latest, failed_parsers = parse_in_parallel(
+                file_path,
+                all_parsers,
+                workers,
+                backend,
+                high_water_marks,
+                date_filter,
+                timings,
+            )
+        else:
+            dispatcher = ParserDispatcher(
+                all_parsers, backend, high_water_marks, date_filter, profiler.detailed
+            )
+            with open_export_xml(file_path) as xml_file:
+                dispatcher.run(xml_file)
+            latest = dispatcher.latest
+            failed_parsers = dispatcher.failed_parsers
+            timings = dispatcher.timings
+        metrics["bytes_read"] = os.path.getsize(file_path)
+        metrics["records_out"] = sum(len(parser.data) for parser in all_parsers)
+        metrics["parsers"] = {}
+        for parser in all_parsers:
+            name = type(parser).__name__
+            seconds, count = (timings or {}).get(name, (None, None))
+            metrics["parsers"][name] = {
+                "wall_time": seconds,
+                "records_in": count,
+                "records_out": len(parser.data),
+            }
+    logger.info(f"Single pass over {file_path} finished.")
+    # Incomplete data must not be saved, cached or checkpointed as if it were complete
+    raise_for_failed_parsers(failed_parsers)
+
+    with profiler.stage("collect_parsed") as metrics:
+        # Process each category of data
+        for category, category_parsers in instances.items():
+            category_data = None
+            logger.info(f"Collecting parsed category: {category}")
+
+            for parser in category_parsers:
                 logger.info(
-                    f"Parsed {len(parsed_data)} records with {parser_class.__name__} in {parser_duration:.2f} seconds."
+                    f"Parsed {len(parser.data)} records with {type(parser).__name__}."
+                )
+                total_records += len(parser.data)
+                # Combine all data from parsers in the same category
+                if category_data is None:
+                    category_data = parser.data
+                else:
+                    category_data.extend(parser.data)
+
+            # Save data per category
+            category_df = records_to_dataframe(category_data)
+            if incremental and not category_df.empty:
+                state.add_pending_dates(
+                    category, date_keys(category_df[PARSED_DATE_COLUMNS[category]])
                 )
-                total_records += len(parsed_data)
-            except Exception as e:
-                logger.error(
-                    f"Error parsing {category} with {parser_class.__name__}: {e}",
-                    exc_info=True,
+                if append:
+                    append_frame_to_file(
+                        category_df, PARSED_DATA_DIRECTORY, f"{category}_data"
+                    )
+            if persist and not append:
+                save_frame_to_file(
+                    category_df, PARSED_DATA_DIRECTORY, f"{category}_data"
                 )
-        # Save data per category
-        json_filename = f"{category}_data.json"
-        save_json_to_file(category_data, PARSED_DATA_DIRECTORY, json_filename)
-        data[category] = category_data
+            data[category] = category_df
+        metrics["records_out"] = total_records
+
+    if heart_rate_parser is not None:
+        logger.info(f"Parsed {len(heart_rate_parser.data)} heart-rate samples.")
+        with profiler.stage("store_heart_rate") as metrics:
+            store = HeartRateStore()
+            if not append:
+                store.clear()
+            store.append(
+                *heart_rate_parser.data.to_arrays(),
+                source=key if cache is not None else None,
+            )
+            metrics["records_in"] = len(heart_rate_parser.data)
+            metrics["records_out"] = len(store)
+
+    # Only reached when every parser finished, so a partial parse is never cached
+    if cache is not None:
+        cache.save(key, data)
+
+    if incremental:
+        # Saved after the parsed data so a failed run (or one where a parser failed,
+        # see raise_for_failed_parsers above) is simply parsed again
+        state.update_high_water_marks(latest)
+        state.save()
 
     end_time = time.time()
     duration = end_time - start_time
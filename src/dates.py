@@ -0,0 +1,212 @@
+# src/dates.py
+from datetime import date
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+# Sentinel for missing timestamps; numpy reads the minimum int64 as NaT
+NAT = -(2**63)
+
+# Layout of "YYYY-MM-DD hh:mm:ss +hhmm"
+APPLE_DATE_WIDTH = 25
+APPLE_DATE_SEPARATORS = {4: "-", 7: "-", 10: " ", 13: ":", 16: ":", 19: " "}
+APPLE_DATE_DIGITS = [0, 1, 2, 3, 5, 6, 8, 9, 11, 12, 14, 15, 17, 18, 21, 22, 23, 24]
+
+
+@lru_cache(maxsize=None)
+def epoch_day(day: str) -> int:
+    """Returns the number of days since 1970-01-01 for a "YYYY-MM-DD" string."""
+    return date(int(day[0:4]), int(day[5:7]), int(day[8:10])).toordinal() - EPOCH_ORDINAL
+
+
+def parse_apple_date(value: str) -> tuple:
+    """
+    Parses an Apple Health date such as "2024-03-01 07:12:44 +0100".
+    Returns the UTC epoch in seconds and the UTC offset in minutes.
+    """
+    if not value:
+        return NAT, 0
+    offset = int(value[21:23]) * 60 + int(value[23:25])
+    if value[20] == "-":
+        offset = -offset
+    seconds = int(value[11:13]) * 3600 + int(value[14:16]) * 60 + int(value[17:19])
+    return epoch_day(value[0:10]) * 86400 + seconds - offset * 60, offset
+
+
+def date_keys(values: pd.Series) -> pd.Series:
+    """Returns the "YYYY-MM-DD" day of each datetime or Apple date string in values."""
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values.dt.strftime("%Y-%m-%d")
+    # Apple date strings start with the local day
+    return values.astype(str).str[:10]
+
+
+def decode_apple_dates(values) -> tuple:
+    """
+    Vectorized parse_apple_date for a column of Apple Health date strings.
+    Returns int64 UTC epochs in seconds (NAT for missing values) and int16 UTC
+    offsets in minutes. Strings in another format fall back to pd.to_datetime.
+    """
+    strings = pd.Series(values).astype(object)
+    missing = strings.isna().to_numpy()
+    strings = strings.where(~missing, "").astype(str)
+
+    try:
+        raw = strings.to_numpy(dtype=f"S{APPLE_DATE_WIDTH}")
+    except UnicodeEncodeError:
+        raw = np.zeros(len(strings), dtype=f"S{APPLE_DATE_WIDTH}")
+    lengths = strings.str.len().to_numpy()
+    epochs, offsets, valid = _decode_date_matrix(raw, lengths == APPLE_DATE_WIDTH)
+
+    fallback = ~valid & ~missing
+    if fallback.any():
+        epochs[fallback], offsets[fallback] = _parse_other_dates(strings[fallback])
+    return epochs, offsets
+
+
+def decode_apple_date_bytes(values: np.ndarray) -> tuple:
+    """decode_apple_dates for a NumPy array of byte strings, where b"" is a missing value."""
+    lengths = np.char.str_len(values)
+    raw = values.astype(f"S{APPLE_DATE_WIDTH}")
+    epochs, offsets, valid = _decode_date_matrix(raw, lengths == APPLE_DATE_WIDTH)
+
+    fallback = ~valid & (lengths > 0)
+    if fallback.any():
+        strings = pd.Series(np.char.decode(values[fallback], "utf-8"), dtype=object)
+        epochs[fallback], offsets[fallback] = _parse_other_dates(strings)
+    return epochs, offsets
+
+
+def _decode_date_matrix(raw: np.ndarray, valid: np.ndarray) -> tuple:
+    """Decodes zero-padded "S25" dates; returns epochs, offsets and which rows were valid."""
+    # One row of bytes per date string
+    matrix = raw.view(np.uint8).reshape(len(raw), APPLE_DATE_WIDTH)
+
+    valid = valid.copy()
+    for position, separator in APPLE_DATE_SEPARATORS.items():
+        valid &= matrix[:, position] == ord(separator)
+    valid &= (matrix[:, 20] == ord("+")) | (matrix[:, 20] == ord("-"))
+    # Bytes below "0" wrap around, so a single comparison checks for a digit
+    valid &= ((matrix[:, APPLE_DATE_DIGITS] - ord("0")) <= 9).all(axis=1)
+
+    def number(start: int, stop: int) -> np.ndarray:
+        result = np.zeros(len(matrix), dtype=np.int64)
+        for position in range(start, stop):
+            result = result * 10 + (matrix[:, position].astype(np.int64) - ord("0"))
+        return result
+
+    offsets = number(21, 23) * 60 + number(23, 25)
+    offsets = np.where(matrix[:, 20] == ord("-"), -offsets, offsets)
+    seconds = number(11, 13) * 3600 + number(14, 16) * 60 + number(17, 19)
+    days = civil_to_epoch_days(number(0, 4), number(5, 7), number(8, 10))
+    epochs = np.where(valid, days * 86400 + seconds - offsets * 60, NAT)
+    offsets = np.where(valid, offsets, 0).astype(np.int16)
+    return epochs, offsets, valid
+
+
+def _parse_other_dates(strings: pd.Series) -> tuple:
+    """
+    Parses dates that are not in Apple's layout one by one with pd.Timestamp, keeping
+    their UTC offsets. Dates without an offset are taken as UTC; unparsable ones are NAT.
+    """
+    epochs = np.full(len(strings), NAT, dtype=np.int64)
+    offsets = np.zeros(len(strings), dtype=np.int16)
+    for row, value in enumerate(strings):
+        try:
+            timestamp = pd.Timestamp(value)
+        except (TypeError, ValueError):
+            continue
+        if timestamp is pd.NaT:
+            continue
+        offset = timestamp.utcoffset()
+        if offset is not None:
+            offsets[row] = offset.total_seconds() // 60
+            timestamp = timestamp.tz_convert(None)
+        epochs[row] = timestamp.value // 10**9
+    return epochs, offsets
+
+
+def civil_to_epoch_days(year, month, day) -> np.ndarray:
+    """Vectorized days since 1970-01-01 for proleptic Gregorian dates."""
+    year = year - (month <= 2)
+    era = year // 400
+    year_of_era = year - era * 400
+    day_of_year = (153 * ((month + 9) % 12) + 2) // 5 + day - 1
+    day_of_era = year_of_era * 365 + year_of_era // 4 - year_of_era // 100 + day_of_year
+    return era * 146097 + day_of_era - 719468
+
+
+def local_datetimes(epochs, offsets) -> np.ndarray:
+    """Returns naive local wall-clock datetime64[ns] values from UTC epochs and offsets."""
+    epochs = np.asarray(epochs, dtype=np.int64)
+    offsets = np.asarray(offsets, dtype=np.int64)
+    local = np.where(epochs == NAT, NAT, epochs + offsets * 60)
+    return local.astype("datetime64[s]").astype("datetime64[ns]")
+
+
+class DateFilter:
+    """
+    Date window for the pipeline: inclusive start and end days, a list of years, or both.
+    Dates are compared on their local day, as written at the start of Apple date strings.
+    """
+
+    def __init__(self, start=None, end=None, years: list = None):
+        # Accepts "YYYY-MM-DD" strings, dates or Timestamps
+        self.start = str(start)[:10] if start is not None else None
+        self.end = str(end)[:10] if end is not None else None
+        self.years = sorted(int(year) for year in years) if years else None
+        self.year_prefixes = (
+            frozenset(f"{year:04d}" for year in self.years) if self.years else None
+        )
+
+    def __repr__(self) -> str:
+        return f"DateFilter(start={self.start!r}, end={self.end!r}, years={self.years!r})"
+
+    def matches(self, value: str) -> bool:
+        """Checks a raw Apple date string by comparing its "YYYY-MM-DD" prefix."""
+        if not value:
+            return False
+        day = value[:10]
+        if self.year_prefixes is not None and day[:4] not in self.year_prefixes:
+            return False
+        if self.start is not None and day < self.start:
+            return False
+        if self.end is not None and day > self.end:
+            return False
+        return True
+
+    def byte_mask(self, values: np.ndarray) -> np.ndarray:
+        """matches for a NumPy array of Apple date byte strings, as a boolean mask."""
+        days = values.astype("S10")
+        mask = np.char.str_len(values) > 0
+        if self.year_prefixes is not None:
+            prefixes = [prefix.encode() for prefix in self.year_prefixes]
+            mask &= np.isin(days.astype("S4"), prefixes)
+        if self.start is not None:
+            mask &= days >= self.start.encode()
+        if self.end is not None:
+            mask &= days <= self.end.encode()
+        return mask
+
+    def mask(self, values: pd.Series) -> pd.Series:
+        """Returns a boolean mask of the datetimes or Apple date strings inside the window."""
+        mask = pd.Series(True, index=values.index)
+        if pd.api.types.is_datetime64_any_dtype(values):
+            if self.years is not None:
+                mask &= values.dt.year.isin(self.years)
+            if self.start is not None:
+                mask &= values >= pd.Timestamp(self.start)
+            if self.end is not None:
+                mask &= values < pd.Timestamp(self.end) + pd.Timedelta(days=1)
+            return mask
+
+        days = values.astype(str).str[:10]
+        if self.year_prefixes is not None:
+            mask &= days.str[:4].isin(self.year_prefixes)
+        if self.start is not None:
+            mask &= days >= self.start
+        if self.end is not None:
+            mask &= days <= self.end
+        return mask & values.notna()
@@ -0,0 +1,155 @@
+# src/heart_rate_store.py
+import json
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+from src.constants.paths import HEART_RATE_DIRECTORY
+from src.dates import NAT
+
+# Samples per chunk; a range query decodes at most the chunks it overlaps
+CHUNK_SAMPLES = 1 << 16
+INDEX_FILE = "index.json"
+
+
+def to_epoch(value) -> int:
+    """Converts an epoch in seconds, a date string or a Timestamp to a UTC epoch in seconds."""
+    if isinstance(value, (int, np.integer)):
+        return int(value)
+    timestamp = pd.Timestamp(value)
+    # Naive times are taken as UTC
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.tz_localize("UTC")
+    return int(timestamp.value // 10**9)
+
+
+def encode_values(values: np.ndarray) -> np.ndarray:
+    """Stores whole heart rates between 0 and 255 as uint8, anything else as float32."""
+    if len(values) and np.all((values >= 0) & (values <= 255) & (values == np.round(values))):
+        return values.astype(np.uint8)
+    return values.astype(np.float32)
+
+
+class HeartRateStore:
+    """
+    Heart-rate samples stored in chunks of memory-mapped .npy files.
+    Each chunk holds delta-encoded int64 UTC epochs (the first delta is the absolute time)
+    and uint8 or float32 values; a JSON index keeps the time span of every chunk,
+    so range queries only open the chunks they overlap.
+    """
+
+    def __init__(self, directory: str = HEART_RATE_DIRECTORY):
+        self.directory = directory
+        # name, start, end (inclusive UTC epochs), count and value dtype of each chunk
+        self.chunks: list = []
+        # Parse cache key of the export the samples were parsed from, if known
+        self.source = None
+        self.load()
+
+    def __len__(self) -> int:
+        return sum(chunk["count"] for chunk in self.chunks)
+
+    @property
+    def index_path(self) -> str:
+        return os.path.join(self.directory, INDEX_FILE)
+
+    def chunk_paths(self, chunk: dict) -> tuple:
+        """Returns the timestamp and value file of a chunk."""
+        name = os.path.join(self.directory, chunk["name"])
+        return f"{name}_time.npy", f"{name}_value.npy"
+
+    def load(self) -> None:
+        """Reads the chunk index, leaving the store empty if there is none."""
+        if not os.path.isfile(self.index_path):
+            return
+        with open(self.index_path) as f:
+            index = json.load(f)
+        self.chunks = index["chunks"]
+        self.source = index.get("source")
+
+    def save_index(self) -> None:
+        """Writes the chunk index atomically."""
+        index = {"source": self.source, "chunks": self.chunks}
+        temp_path = f"{self.index_path}.tmp"
+        with open(temp_path, "w") as f:
+            json.dump(index, f, indent=4)
+        os.replace(temp_path, self.index_path)
+
+    def clear(self) -> None:
+        """Removes every stored sample."""
+        if os.path.isdir(self.directory):
+            shutil.rmtree(self.directory)
+        self.chunks = []
+        self.source = None
+
+    def append(self, timestamps: np.ndarray, values: np.ndarray, source: str = None) -> None:
+        """
+        Adds samples (UTC epochs in seconds and values) in new chunks.
+        Samples without a time or value are dropped.
+        """
+        timestamps = np.asarray(timestamps, dtype=np.int64)
+        values = np.asarray(values, dtype=np.float64)
+        valid = (timestamps != NAT) & ~np.isnan(values)
+        order = np.argsort(timestamps[valid], kind="stable")
+        timestamps, values = timestamps[valid][order], values[valid][order]
+
+        os.makedirs(self.directory, exist_ok=True)
+        number = max((int(chunk["name"][6:]) + 1 for chunk in self.chunks), default=0)
+        for first in range(0, len(timestamps), CHUNK_SAMPLES):
+            chunk_timestamps = timestamps[first : first + CHUNK_SAMPLES]
+            chunk_values = encode_values(values[first : first + CHUNK_SAMPLES])
+            chunk = {
+                "name": f"chunk_{number:06d}",
+                "start": int(chunk_timestamps[0]),
+                "end": int(chunk_timestamps[-1]),
+                "count": len(chunk_timestamps),
+                "dtype": chunk_values.dtype.name,
+            }
+            time_path, value_path = self.chunk_paths(chunk)
+            np.save(time_path, np.diff(chunk_timestamps, prepend=np.int64(0)))
+            np.save(value_path, chunk_values)
+            self.chunks.append(chunk)
+            number += 1
+
+        # The index is written last, so readers never see a partial chunk
+        self.source = source
+        self.save_index()
+        logger.info(f"Stored {len(timestamps)} heart-rate samples in {self.directory}.")
+
+    def samples(self, start=None, end=None) -> tuple:
+        """
+        Returns the UTC epochs (int64) and values (float64) of the samples with
+        start <= time < end, in time order. Only the overlapping chunks are read.
+        """
+        start = to_epoch(start) if start is not None else NAT
+        end = to_epoch(end) if end is not None else np.iinfo(np.int64).max
+
+        timestamps, values = [], []
+        for chunk in self.chunks:
+            if chunk["end"] < start or chunk["start"] >= end:
+                continue
+            time_path, value_path = self.chunk_paths(chunk)
+            chunk_timestamps = np.cumsum(np.load(time_path, mmap_mode="r"))
+            first, last = np.searchsorted(chunk_timestamps, [start, end])
+            timestamps.append(chunk_timestamps[first:last])
+            # Only the pages of the memory-mapped values that are in range are read
+            values.append(np.load(value_path, mmap_mode="r")[first:last].astype(np.float64))
+
+        if not timestamps:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64)
+        timestamps, values = np.concatenate(timestamps), np.concatenate(values)
+        # Chunks appended by incremental runs can overlap in time
+        if np.any(np.diff(timestamps) < 0):
+            order = np.argsort(timestamps, kind="stable")
+            timestamps, values = timestamps[order], values[order]
+        return timestamps, values
+
+    def to_frame(self, start=None, end=None) -> pd.DataFrame:
+        """Returns the samples with start <= time < end as a DataFrame of UTC times and values."""
+        timestamps, values = self.samples(start, end)
+        return pd.DataFrame(
+            {"time": pd.to_datetime(timestamps, unit="s", utc=True), "value": values}
+        )
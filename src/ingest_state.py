@@ -0,0 +1,70 @@
+# src/ingest_state.py
+import json
+import os
+
+from loguru import logger
+
+from src.constants.paths import INGEST_STATE_PATH
+
+
+class IngestState:
+    """
+    Checkpoint for incremental ingestion.
+    high_water_marks maps each record type (or workout activity type) to the latest
+    ingested creationDate as a UTC epoch; pending_dates maps each data category to
+    the days whose cleaned output still has to be recomputed.
+    """
+
+    def __init__(self, path: str = INGEST_STATE_PATH):
+        self.path = path
+        self.high_water_marks: dict = {}
+        self.pending_dates: dict = {}
+
+    @classmethod
+    def load(cls, path: str = INGEST_STATE_PATH) -> "IngestState":
+        """Loads the state file, or returns an empty state if there is none."""
+        state = cls(path)
+        if not os.path.isfile(path):
+            return state
+
+        try:
+            with open(path) as f:
+                saved = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable ingest state {path}: {e}")
+            return state
+
+        state.high_water_marks = saved.get("high_water_marks", {})
+        state.pending_dates = {
+            category: set(dates)
+            for category, dates in saved.get("pending_dates", {}).items()
+        }
+        return state
+
+    def save(self) -> None:
+        """Writes the state file atomically."""
+        directory = os.path.dirname(self.path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+
+        state = {
+            "high_water_marks": self.high_water_marks,
+            "pending_dates": {
+                category: sorted(dates)
+                for category, dates in self.pending_dates.items()
+                if dates
+            },
+        }
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "w") as f:
+            json.dump(state, f, indent=4)
+        os.replace(temp_path, self.path)
+
+    def update_high_water_marks(self, latest: dict) -> None:
+        """Raises the high-water marks to the latest ingested timestamps."""
+        for key, stamp in latest.items():
+            self.high_water_marks[key] = max(stamp, self.high_water_marks.get(key, stamp))
+
+    def add_pending_dates(self, category: str, dates) -> None:
+        """Marks days of a category whose cleaned output is out of date."""
+        self.pending_dates.setdefault(category, set()).update(dates)
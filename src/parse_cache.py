@@ -0,0 +1,112 @@
+# src/parse_cache.py
+import hashlib
+import os
+import shutil
+import zipfile
+
+from loguru import logger
+
+from src.constants.paths import PARSE_CACHE_DIRECTORY, PARSE_CACHE_MAX_BYTES
+from src.parsers.registry import RECORD_TYPES, REGISTRY_VERSION
+from src.utils import load_frame_from_file, save_frame_to_file
+
+HASH_BLOCK_BYTES = 1024 * 1024
+
+
+def hash_export(file_path: str) -> str:
+    """
+    Returns a content hash of an export.zip or export.xml.
+    For a zip only the central directory (names, CRC-32s and sizes) is hashed,
+    which identifies the contents without decompressing anything.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    if zipfile.is_zipfile(file_path):
+        with zipfile.ZipFile(file_path) as archive:
+            for info in archive.infolist():
+                digest.update(
+                    f"{info.filename}\0{info.CRC}\0{info.file_size}\n".encode()
+                )
+        return digest.hexdigest()
+
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(HASH_BLOCK_BYTES), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def cache_key(file_path: str, date_filter=None) -> str:
+    """Returns the cache key for an export: its hash, the parser registry version and the date filter."""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(hash_export(file_path).encode())
+    digest.update(f"{REGISTRY_VERSION}\0{sorted(RECORD_TYPES.items())!r}".encode())
+    digest.update(repr(date_filter).encode())
+    return digest.hexdigest()
+
+
+class ParseCache:
+    """Content-addressed cache of parsed DataFrames, evicting least recently used exports."""
+
+    def __init__(
+        self,
+        directory: str = PARSE_CACHE_DIRECTORY,
+        max_bytes: int = PARSE_CACHE_MAX_BYTES,
+    ):
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+    def entry_path(self, key: str) -> str:
+        """Returns the directory holding the cached files for a key."""
+        return os.path.join(self.directory, key)
+
+    def load(self, key: str):
+        """Returns the cached DataFrames per category, or None on a miss."""
+        entry = self.entry_path(key)
+        if not os.path.isdir(entry):
+            return None
+
+        data = {}
+        for filename in sorted(os.listdir(entry)):
+            category, _ = os.path.splitext(filename)
+            data[category] = load_frame_from_file(os.path.join(entry, category))
+        # Mark the entry as recently used
+        os.utime(entry)
+        return data
+
+    def save(self, key: str, data: dict) -> None:
+        """Stores the DataFrames per category, replacing any entry with the same key."""
+        entry = self.entry_path(key)
+        temp_entry = f"{entry}.tmp{os.getpid()}"
+        if os.path.exists(temp_entry):
+            shutil.rmtree(temp_entry)
+
+        for category, df in data.items():
+            save_frame_to_file(df, temp_entry, category)
+
+        # Readers only ever see complete entries
+        if os.path.exists(entry):
+            shutil.rmtree(entry)
+        os.replace(temp_entry, entry)
+        self.evict(keep=key)
+
+    def evict(self, keep: str = None) -> None:
+        """Removes least recently used entries until the cache fits in max_bytes."""
+        entries = []
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            if not os.path.isdir(path) or ".tmp" in name:
+                continue
+            size = sum(
+                os.path.getsize(os.path.join(path, filename))
+                for filename in os.listdir(path)
+            )
+            entries.append((os.path.getmtime(path), name, size))
+
+        total = sum(size for _, _, size in entries)
+        for _, name, size in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if name == keep:
+                continue
+            logger.info(f"Evicting cached parse {name} ({size} bytes).")
+            shutil.rmtree(os.path.join(self.directory, name))
+            total -= size
@@ -0,0 +1,69 @@
+# src/parsers/backends.py
+import xml.etree.ElementTree as ET
+
+from loguru import logger
+
+from src.parsers.scanner import iter_elements_scanner
+
+try:
+    from lxml import etree as lxml_etree
+except ImportError:  # lxml is optional
+    lxml_etree = None
+
+
+def iter_elements_stdlib(source, tags):
+    """Yields every element whose tag is in tags using xml.etree, freeing finished top-level elements."""
+    depth = 0
+    root = None
+    for event, elem in ET.iterparse(source, events=("start", "end")):
+        if event == "start":
+            if root is None:
+                root = elem
+            depth += 1
+            continue
+
+        depth -= 1
+        if elem.tag in tags:
+            yield elem
+            elem.clear()
+        if depth == 1:
+            # Drop processed children of the root element so memory stays bounded
+            root.clear()
+
+
+def iter_elements_lxml(source, tags):
+    """Yields every element whose tag is in tags using lxml, which only reports events for those tags."""
+    # Entities are never used in Apple Health exports, so leave them unresolved
+    for _, elem in lxml_etree.iterparse(
+        source, events=("end",), tag=tuple(tags), resolve_entities=False
+    ):
+        yield elem
+        elem.clear(keep_tail=True)
+        # Free finished siblings (including untracked ones such as ActivitySummary)
+        parent = elem.getparent()
+        if parent is not None:
+            while elem.getprevious() is not None:
+                del parent[0]
+
+
+BACKENDS = {
+    "stdlib": iter_elements_stdlib,
+    "lxml": iter_elements_lxml,
+    "scanner": iter_elements_scanner,
+}
+
+
+def get_backend(name: str = None):
+    """Returns the element iterator for a backend, the stdlib one by default."""
+    if name is None:
+        name = "stdlib"
+
+    if name == "lxml" and lxml_etree is None:
+        logger.warning("lxml is not installed, falling back to the stdlib XML backend.")
+        name = "stdlib"
+
+    if name not in BACKENDS:
+        raise ValueError(
+            f"Unknown parser backend: {name}. Choose from {sorted(BACKENDS)}."
+        )
+    return BACKENDS[name]
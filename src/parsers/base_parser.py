@@ -1,30 +1,69 @@
 # src/parsers/base_parser.py
 import os
-import xml.etree.ElementTree as ET
 
+import numpy as np
 from loguru import logger
 
+from src.parsers.dispatcher import ParserDispatcher, raise_for_failed_parsers
+
+
+def to_float(value) -> float:
+    """Converts an attribute value to a float, NaN if it is missing or malformed."""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return float("nan")
+
+
+def to_floats(values: np.ndarray) -> np.ndarray:
+    """Vectorized to_float for a NumPy array of byte strings, where b"" is a missing value."""
+    try:
+        return np.where(values == b"", b"nan", values).astype(np.float64)
+    except ValueError:
+        # Some value is malformed; only then convert one by one
+        return np.array([to_float(value) for value in values], dtype=np.float64)
+
 
 class BaseParser:
+    # Element tag and routing attribute values this parser consumes.
+    # An empty record_types accepts every element with the tag.
+    tag: str = "Record"
+    record_types: tuple = ()
+    # Parsers of flat Records can implement handle_record, or handle_records for a whole
+    # RecordBatch, which the scanner backend calls instead of building elements
+    flat_records: bool = False
+
     def __init__(self, file_path: str):
         self.file_path = file_path
         self.data: list = []
 
-    def parse(self) -> list:
-        """Parses the XML file specified by the file_path attribute.."""
+    def parse(self):
+        """
+        Parses the XML file specified by the file_path attribute and returns the parsed data.
+        Raises ParserFailedError if the parser failed on an element.
+        """
         if not os.path.exists(self.file_path):
             logger.error(f"File not found: {self.file_path}")
             return []
 
-        for _, elem in ET.iterparse(self.file_path, events=("end",)):
-            self.handle_element(elem)
-            elem.clear()
+        dispatcher = ParserDispatcher([self])
+        dispatcher.run(self.file_path)
+        raise_for_failed_parsers(dispatcher.failed_parsers)
         return self.data
 
     def handle_element(self, elem):
         # This method will be overridden in subclasses
         pass
 
+    def handle_record(self, record_type, start_date, end_date, value, unit):
+        """Handles a flat Record from its attributes (only called when flat_records is set)."""
+        raise NotImplementedError
+
+    def handle_records(self, batch):
+        """Handles a RecordBatch of flat Records, one handle_record call per Record."""
+        for record in batch.rows():
+            self.handle_record(*record)
+
     def extract_common_fields(self, elem, record_type):
         """Extracts common fields such as date, value, unit, and type from the element."""
         return {
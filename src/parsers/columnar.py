@@ -0,0 +1,119 @@
+# src/parsers/columnar.py
+from array import array
+
+import numpy as np
+import pandas as pd
+
+from src.dates import decode_apple_date_bytes, local_datetimes, parse_apple_date
+from src.parsers.base_parser import to_float, to_floats
+
+
+def remap_codes(column: array, code_map: list) -> bytes:
+    """Translates an int16 code column through code_map with one NumPy take; -1 stays -1."""
+    codes = np.frombuffer(column, dtype=np.int16)
+    if code_map == list(range(len(code_map))):
+        return codes.tobytes()
+    # The trailing -1 is what index -1 (a missing value) picks
+    lookup = np.array(code_map + [-1], dtype=np.int16)
+    return lookup.take(codes).tobytes()
+
+
+class ColumnarRecords:
+    """
+    Column-oriented storage for quantity records.
+    Types and units are dictionary encoded, values are stored as doubles and
+    start dates as int64 UTC epochs plus a UTC offset in minutes.
+    """
+
+    def __init__(self):
+        self.types: list = []
+        self.units: list = []
+        self.type_codes: dict = {}
+        self.unit_codes: dict = {}
+        self.type_column = array("h")
+        self.unit_column = array("h")
+        self.values = array("d")
+        self.timestamps = array("q")
+        self.offsets = array("h")
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def encode(self, codes: dict, names: list, name) -> int:
+        """Returns the dictionary code for name, adding it if it is new (-1 for None)."""
+        if name is None:
+            return -1
+        code = codes.get(name)
+        if code is None:
+            code = codes[name] = len(names)
+            names.append(name)
+        return code
+
+    def append(self, record_type: str, start_date: str, value: str, unit: str) -> None:
+        """Appends a single record."""
+        timestamp, offset = parse_apple_date(start_date)
+        number = to_float(value)
+
+        self.type_column.append(self.encode(self.type_codes, self.types, record_type))
+        self.unit_column.append(self.encode(self.unit_codes, self.units, unit))
+        self.values.append(number)
+        self.timestamps.append(timestamp)
+        self.offsets.append(offset)
+
+    def append_batch(
+        self, names: list, name_codes, start_dates, values, unit_names: list, unit_codes
+    ) -> None:
+        """
+        Appends many records at once. Types and units are given as names[name_codes] and
+        unit_names[unit_codes], start dates and values as NumPy byte string arrays.
+        """
+        timestamps, offsets = decode_apple_date_bytes(start_dates)
+        type_map = self.encode_all(self.type_codes, self.types, names, name_codes)
+        unit_map = self.encode_all(self.unit_codes, self.units, unit_names, unit_codes)
+        self.type_column.frombytes(type_map.take(name_codes).tobytes())
+        self.unit_column.frombytes(unit_map.take(unit_codes).tobytes())
+        self.values.frombytes(to_floats(values).tobytes())
+        self.timestamps.frombytes(timestamps.astype(np.int64).tobytes())
+        self.offsets.frombytes(offsets.astype(np.int16).tobytes())
+
+    def encode_all(
+        self, codes: dict, names: list, batch_names: list, batch_codes
+    ) -> np.ndarray:
+        """
+        Returns the dictionary code of each of batch_names as an int16 lookup, adding new
+        names in the order they first appear in batch_codes, as append would.
+        """
+        lookup = np.full(len(batch_names), -1, dtype=np.int16)
+        used, first = np.unique(batch_codes, return_index=True)
+        for code in used[np.argsort(first)].tolist():
+            lookup[code] = self.encode(codes, names, batch_names[code])
+        return lookup
+
+    def extend(self, other: "ColumnarRecords") -> None:
+        """Appends all records of another accumulator, re-mapping its dictionary codes."""
+        type_map = [self.encode(self.type_codes, self.types, name) for name in other.types]
+        unit_map = [self.encode(self.unit_codes, self.units, name) for name in other.units]
+        self.type_column.frombytes(remap_codes(other.type_column, type_map))
+        self.unit_column.frombytes(remap_codes(other.unit_column, unit_map))
+        self.values.extend(other.values)
+        self.timestamps.extend(other.timestamps)
+        self.offsets.extend(other.offsets)
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """Converts the columns to a DataFrame without creating per-row Python objects."""
+        timestamps = np.frombuffer(self.timestamps, dtype=np.int64)
+        offsets = np.frombuffer(self.offsets, dtype=np.int16)
+
+        return pd.DataFrame(
+            {
+                # Local wall-clock time, the date as written in the export
+                "date": local_datetimes(timestamps, offsets),
+                "value": np.frombuffer(self.values, dtype=np.float64),
+                "unit": pd.Categorical.from_codes(
+                    np.frombuffer(self.unit_column, dtype=np.int16), categories=self.units
+                ),
+                "type": pd.Categorical.from_codes(
+                    np.frombuffer(self.type_column, dtype=np.int16), categories=self.types
+                ),
+            }
+        )
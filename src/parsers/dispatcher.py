@@ -0,0 +1,195 @@
+# src/parsers/dispatcher.py
+import time
+
+import numpy as np
+from loguru import logger
+
+from src.constants.export import ROUTING_ATTRIBUTES
+from src.dates import NAT, decode_apple_date_bytes, parse_apple_date
+from src.parsers.backends import get_backend
+from src.parsers.scanner import RecordBatch, scan_export
+
+
+class ParserFailedError(RuntimeError):
+    """Raised when parsers were disabled by errors during a pass, so their data is incomplete."""
+
+
+def raise_for_failed_parsers(failed_parsers: dict) -> None:
+    """Raises ParserFailedError if any parser failed, naming each with its first error."""
+    if failed_parsers:
+        details = ", ".join(f"{name}: {error}" for name, error in failed_parsers.items())
+        raise ParserFailedError(f"Parsers failed, their data is incomplete ({details})")
+
+
+class ParserDispatcher:
+    """Walks the export once and routes each element to every registered parser."""
+
+    def __init__(
+        self,
+        parsers: list,
+        backend: str = None,
+        high_water_marks: dict = None,
+        date_filter=None,
+        timed: bool = False,
+    ):
+        self.parsers = list(parsers)
+        self.backend = backend
+        # Elements whose startDate is outside the DateFilter never reach the parsers
+        self.date_filter = date_filter
+        # With high-water marks, elements created at or before the mark are skipped
+        self.high_water_marks = high_water_marks
+        # Latest creationDate per routing value among the elements handled without errors
+        self.latest: dict = {}
+        # Parser class name -> error that disabled it; their data stops at that element
+        self.failed_parsers: dict = {}
+        # With timed=True: parser class name -> [seconds in its handlers, elements handled]
+        self.timings: dict = {} if timed else None
+        self.routes: dict = {}
+        self.defaults: dict = {}
+        self.build_routes()
+
+    def build_routes(self) -> None:
+        """Compiles the parsers into a {tag: {attribute value: [parsers]}} lookup table."""
+        self.routes = {}
+        self.defaults = {}
+
+        # Parsers without record types accept every element with their tag
+        for parser in self.parsers:
+            if not parser.record_types:
+                self.defaults.setdefault(parser.tag, []).append(parser)
+                self.routes.setdefault(parser.tag, {})
+
+        for parser in self.parsers:
+            for record_type in parser.record_types:
+                table = self.routes.setdefault(parser.tag, {})
+                if record_type not in table:
+                    table[record_type] = list(self.defaults.get(parser.tag, []))
+                table[record_type].append(parser)
+
+    def dispatch(self, elem) -> None:
+        """Hands a single element to every parser registered for its tag and type."""
+        table = self.routes.get(elem.tag)
+        if table is None:
+            return
+
+        key = elem.attrib.get(ROUTING_ATTRIBUTES.get(elem.tag, "type"))
+        parsers = table.get(key, self.defaults.get(elem.tag, ()))
+        if (
+            parsers
+            and self.date_filter is not None
+            and not self.date_filter.matches(elem.attrib.get("startDate"))
+        ):
+            return
+        stamp = None
+        if parsers and self.high_water_marks is not None:
+            stamp = self.created_stamp(elem)
+            if stamp <= self.high_water_marks.get(key, NAT):
+                return
+
+        for parser in parsers:
+            self.call(parser, "handle_element", 1, elem)
+
+        # Once a parser failed the marks stop advancing, so its missing data is parsed again
+        if stamp is not None and not self.failed_parsers and stamp > self.latest.get(key, NAT):
+            self.latest[key] = stamp
+
+    def dispatch_records(self, batch) -> None:
+        """
+        Hands a RecordBatch of flat Records to the parsers registered for their types
+        through handle_records, applying the date filter and high-water marks per column.
+        """
+        table = self.routes.get("Record", {})
+        names, type_codes = batch.type_names, batch.type_codes
+
+        keep = np.ones(len(batch), dtype=bool)
+        if self.date_filter is not None:
+            keep &= self.date_filter.byte_mask(batch.start_dates)
+        stamps = None
+        if self.high_water_marks is not None:
+            created = np.where(
+                batch.creation_dates == b"", batch.start_dates, batch.creation_dates
+            )
+            stamps = decode_apple_date_bytes(created)[0]
+            marks = [self.high_water_marks.get(name, NAT) for name in names]
+            keep &= stamps > np.array(marks, dtype=np.int64)[type_codes]
+
+        # Parser -> codes of the types routed to it
+        routed: dict = {}
+        for code, name in enumerate(names):
+            for parser in table.get(name, self.defaults.get("Record", ())):
+                routed.setdefault(parser, []).append(code)
+        for parser, codes in routed.items():
+            rows = keep & np.isin(type_codes, codes)
+            if rows.any():
+                self.call(parser, "handle_records", int(rows.sum()), batch.take(rows))
+
+        # Once a parser failed the marks stop advancing, so its missing data is parsed again
+        if stamps is None or self.failed_parsers:
+            return
+        routed_codes = {code for codes in routed.values() for code in codes}
+        for code in routed_codes:
+            kept = stamps[keep & (type_codes == code)]
+            if len(kept) and kept.max() > self.latest.get(names[code], NAT):
+                self.latest[names[code]] = int(kept.max())
+
+    def call(self, parser, method: str, count: int, *args) -> None:
+        """Calls a handler of one parser, timing it if enabled and disabling it if it raises."""
+        try:
+            if self.timings is None:
+                getattr(parser, method)(*args)
+                return
+            start = time.perf_counter()
+            getattr(parser, method)(*args)
+            timing = self.timings.setdefault(type(parser).__name__, [0.0, 0])
+            timing[0] += time.perf_counter() - start
+            timing[1] += count
+        except Exception as e:
+            self.disable(parser, e)
+
+    def disable(self, parser, error: Exception) -> None:
+        """Removes a parser that raised from the routes for the rest of the run."""
+        logger.error(f"Error in {type(parser).__name__}, disabling it for this run: {error}")
+        self.failed_parsers.setdefault(type(parser).__name__, repr(error))
+        self.parsers.remove(parser)
+        self.build_routes()
+
+    @staticmethod
+    def created_stamp(elem) -> int:
+        """Returns the creationDate (or startDate) of an element as an epoch, NAT if missing."""
+        created = elem.attrib.get("creationDate") or elem.attrib.get("startDate")
+        return parse_apple_date(created)[0]
+
+    def run(self, source) -> list:
+        """Parses the source (path or binary file object) once and returns the parsers."""
+        if not self.routes:
+            return self.parsers
+
+        # Tag -> routed attribute values, or None when a parser accepts every value
+        tags = {
+            tag: None if tag in self.defaults else set(table)
+            for tag, table in self.routes.items()
+        }
+        if self.backend == "scanner":
+            # Flat Records skip the element and reach handle_records in batches
+            record_types = self.flat_record_types()
+            for item in scan_export(
+                source, tags, record_types, self.high_water_marks is not None
+            ):
+                if isinstance(item, RecordBatch):
+                    self.dispatch_records(item)
+                else:
+                    self.dispatch(item)
+            return self.parsers
+
+        iter_elements = get_backend(self.backend)
+        for elem in iter_elements(source, tags):
+            self.dispatch(elem)
+        return self.parsers
+
+    def flat_record_types(self) -> set:
+        """Returns the routed Record types whose parsers all accept handle_records."""
+        return {
+            record_type
+            for record_type, parsers in self.routes.get("Record", {}).items()
+            if all(parser.flat_records for parser in parsers)
+        }
@@ -1,121 +1,73 @@
 # src/parser/health_parsers.py
-from src.constants.health import (
-    HK_RESTING_HEARTRATE,
-    HK_RUNNING_POWER,
-    HK_RUNNING_SPEED,
-    HK_RUNNING_VERTICAL_OSCILLATION,
-    HK_VO2_MAX,
-    HK_HEARTRATE_RECOVERY,
-    HK_WALKING_STEP_LENGTH,
-    HK_RESPIRATORY_RATE,
-    HK_WALKING_SPEED,
-    HK_STAIR_ASCENT_SPEED,
-    HK_WALKING_HEARTRATE,
-    HK_RUNNING_STRIDE_LENGTH,
-    HK_RUNNING_GROUND_CONTACT_TIME,
-)
-from src.parsers.base_parser import BaseParser
-
-
-class RestingHeartRateParser(BaseParser):
-    """A parser for extracting resting heart rate records from Apple Health data."""
-    def handle_element(self, elem):
-        if elem.tag == "Record" and elem.attrib.get("type") == HK_RESTING_HEARTRATE:
-            record = self.extract_common_fields(elem, "Resting Heartrate")
-            self.data.append(record)
+from array import array
 
+import numpy as np
 
-class Vo2MaxParser(BaseParser):
-    """A parser for extracting VO2 Max records from Apple Health data."""
-    def handle_element(self, elem):
-        if elem.tag == "Record" and elem.attrib.get("type") == HK_VO2_MAX:
-            record = self.extract_common_fields(elem, "VO2 Max")
-            self.data.append(record)
+from src.constants.health import HK_HEARTRATE
+from src.dates import decode_apple_date_bytes, parse_apple_date
+from src.parsers.base_parser import BaseParser, to_float, to_floats
+from src.parsers.record_parser import RecordTypeParser
 
 
-class HeartrateRecoveryParser(BaseParser):
-    """A parser for extracting heart rate recovery records from Apple Health data."""
-    def handle_element(self, elem):
-        if elem.tag == "Record" and elem.attrib.get("type") == HK_HEARTRATE_RECOVERY:
-            record = self.extract_common_fields(elem, "Heartrate Recovery")
-            self.data.append(record)
+class HealthRecordParser(RecordTypeParser):
+    """A parser for extracting the registered health records from Apple Health data."""
 
+    category = "health"
 
-class WalkingStepLengthParser(BaseParser):
-    """A parser for extracting walking step length records from Apple Health data."""
-    def handle_element(self, elem):
-        if elem.tag == "Record" and elem.attrib.get("type") == HK_WALKING_STEP_LENGTH:
-            record = self.extract_common_fields(elem, "Walking Step Length")
-            self.data.append(record)
 
+class HeartRateSamples:
+    """Compact accumulator of heart-rate samples: int64 UTC epochs and double values."""
 
-class RespiratoryRateParser(BaseParser):
-    """A parser for extracting respiratory rate records from Apple Health data."""
-    def handle_element(self, elem):
-        if elem.tag == "Record" and elem.attrib.get("type") == HK_RESPIRATORY_RATE:
-            record = self.extract_common_fields(elem, "Respiratory Rate")
-            self.data.append(record)
+    def __init__(self):
+        self.timestamps = array("q")
+        self.values = array("d")
 
+    def __len__(self) -> int:
+        return len(self.values)
 
-class WalkingSpeedParser(BaseParser):
-    """A parser for extracting walking speed records from Apple Health data."""
-    def handle_element(self, elem):
-        if elem.tag == "Record" and elem.attrib.get("type") == HK_WALKING_SPEED:
-            record = self.extract_common_fields(elem, "Walking Speed")
-            self.data.append(record)
+    def append(self, start_date: str, value: str) -> None:
+        """Appends a single sample."""
+        timestamp, _ = parse_apple_date(start_date)
+        self.timestamps.append(timestamp)
+        self.values.append(to_float(value))
 
+    def append_batch(self, start_dates, values) -> None:
+        """Appends many samples from NumPy byte string columns (b"" for a missing value)."""
+        timestamps, _ = decode_apple_date_bytes(start_dates)
+        self.timestamps.frombytes(timestamps.astype(np.int64).tobytes())
+        self.values.frombytes(to_floats(values).tobytes())
 
-class StairAscentSpeedParser(BaseParser):
-    """A parser for extracting stair ascent speed records from Apple Health data."""
-    def handle_element(self, elem):
-        if elem.tag == "Record" and elem.attrib.get("type") == HK_STAIR_ASCENT_SPEED:
-            record = self.extract_common_fields(elem, "Stair Ascent Speed")
-            self.data.append(record)
+    def extend(self, other: "HeartRateSamples") -> None:
+        """Appends all samples of another accumulator."""
+        self.timestamps.extend(other.timestamps)
+        self.values.extend(other.values)
 
+    def to_arrays(self) -> tuple:
+        """Returns the timestamps and values as NumPy arrays without copying."""
+        return (
+            np.frombuffer(self.timestamps, dtype=np.int64),
+            np.frombuffer(self.values, dtype=np.float64),
+        )
 
-class WalkingHeartrateParser(BaseParser):
-    """A parser for extracting walking heartrate records from Apple Health data."""
-    def handle_element(self, elem):
-        if elem.tag == "Record" and elem.attrib.get("type") == HK_WALKING_HEARTRATE:
-            record = self.extract_common_fields(elem, "Walking Heartrate")
-            self.data.append(record)
 
+class HeartRateParser(BaseParser):
+    """
+    A parser for the full heart-rate time series, one sample per Record.
+    Samples are kept in compact arrays instead of per-record dicts, since heart rate
+    is by far the largest record type in most exports.
+    """
 
-class RunningStrideLengthParser(BaseParser):
-    """A parser for extracting running stride length records from Apple Health data."""
-    def handle_element(self, elem):
-        if elem.tag == "Record" and elem.attrib.get("type") == HK_RUNNING_STRIDE_LENGTH:
-            record = self.extract_common_fields(elem, "Running Stride Length")
-            self.data.append(record)
+    record_types = (HK_HEARTRATE,)
+    flat_records = True
 
+    def __init__(self, file_path: str):
+        super().__init__(file_path)
+        self.data = HeartRateSamples()
 
-class RunningGroundContactTimeParsers(BaseParser):
-    """A parser for extracting running ground contact time records from Apple Health data."""
     def handle_element(self, elem):
-        if elem.tag == "Record" and elem.attrib.get("type") == HK_RUNNING_GROUND_CONTACT_TIME:
-            record = self.extract_common_fields(elem, "Running Ground Contact Time")
-            self.data.append(record)
+        """Appends the startDate and value of a heart-rate Record."""
+        attrib = elem.attrib
+        self.data.append(attrib.get("startDate"), attrib.get("value"))
 
-
-class RunningVerticalOscillationParser(BaseParser):
-    """A parser for extracting running vertical oscillation records from Apple Health data."""
-    def handle_element(self, elem):
-        if elem.tag == "Record" and elem.attrib.get("type") == HK_RUNNING_VERTICAL_OSCILLATION:
-            record = self.extract_common_fields(elem, "Running Vertical Oscillation")
-            self.data.append(record)
-
-
-class RunningSpeedParser(BaseParser):
-    """A parser for extracting running speed records from Apple Health data."""
-    def handle_element(self, elem):
-        if elem.tag == "Record" and elem.attrib.get("type") == HK_RUNNING_SPEED:
-            record = self.extract_common_fields(elem, "Running Speed")
-            self.data.append(record)
-
-
-class RunningPowerParser(BaseParser):
-    """A parser for extracting running power records from Apple Health data."""
-    def handle_element(self, elem):
-        if elem.tag == "Record" and elem.attrib.get("type") == HK_RUNNING_POWER:
-            record = self.extract_common_fields(elem, "Running Power")
-            self.data.append(record)
+    def handle_records(self, batch):
+        self.data.append_batch(batch.start_dates, batch.values)
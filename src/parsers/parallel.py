@@ -0,0 +1,169 @@
+# src/parsers/parallel.py
+import copy
+import io
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+from loguru import logger
+
+from src.parsers.dispatcher import ParserDispatcher
+
+# Upper bound on the bytes a single worker task reads into memory
+MAX_RANGE_BYTES = 64 * 1024 * 1024
+SEARCH_WINDOW_BYTES = 1024 * 1024
+
+ROOT_START_PATTERN = re.compile(rb"<HealthData[\s>][^>]*>")
+ROOT_END_TAG = b"</HealthData>"
+FIRST_CHILD_PATTERN = re.compile(rb"\n([ \t]*)<[A-Za-z]")
+
+
+def find_byte_ranges(file_path: str, ranges: int) -> list:
+    """Splits the file into byte ranges that each start on a top-level <Record or <Workout."""
+    size = os.path.getsize(file_path)
+
+    with open(file_path, "rb") as f:
+        # Locate the root start tag; the internal DTD can make the header large
+        head = b""
+        while True:
+            block = f.read(SEARCH_WINDOW_BYTES)
+            head += block
+            root_match = ROOT_START_PATTERN.search(head)
+            if root_match or not block:
+                break
+        if root_match is None:
+            raise ValueError(f"No <HealthData> element found in {file_path}")
+        first = root_match.end()
+        if len(head) - first < SEARCH_WINDOW_BYTES:
+            head += f.read(SEARCH_WINDOW_BYTES)
+
+        # Top-level elements share the indentation of the root's first child;
+        # nested Records (e.g. inside Correlation) are indented further
+        indent_match = FIRST_CHILD_PATTERN.search(head, first)
+        indent = indent_match.group(1) if indent_match else b""
+        boundary = re.compile(
+            rb"\n" + re.escape(indent) + rb"<(?:Record|Workout)[\s/>]"
+        )
+
+        # The last range stops before the closing root tag
+        f.seek(max(0, size - SEARCH_WINDOW_BYTES))
+        last = f.tell() + f.read().rfind(ROOT_END_TAG)
+        if last < first:
+            raise ValueError(f"No </HealthData> closing tag found in {file_path}")
+
+        offsets = [first]
+        for i in range(1, ranges):
+            target = max(first + (last - first) * i // ranges, offsets[-1])
+            offset = _find_boundary(f, boundary, target, last)
+            if offset is not None and offset > offsets[-1]:
+                offsets.append(offset)
+        offsets.append(last)
+
+    return list(zip(offsets[:-1], offsets[1:]))
+
+
+def _find_boundary(f, boundary, target: int, limit: int):
+    """Returns the offset of the first boundary at or after target, or None."""
+    position = target
+    while position < limit:
+        f.seek(position)
+        window = f.read(min(SEARCH_WINDOW_BYTES, limit - position))
+        match = boundary.search(window)
+        if match:
+            # Start the range at the "<", right after the newline and indentation
+            return position + match.start() + 1
+        if len(window) < SEARCH_WINDOW_BYTES:
+            return None
+        # Overlap windows so a boundary split across two reads is not missed
+        position += len(window) - 64
+    return None
+
+
+def parse_range(
+    file_path: str,
+    start: int,
+    end: int,
+    parsers: list,
+    backend: str = None,
+    high_water_marks: dict = None,
+    date_filter=None,
+    timed: bool = False,
+) -> tuple:
+    """
+    Parses one byte range with fresh copies of the parsers.
+    Returns their data, the latest creationDate seen per routing value, the parsers
+    that failed and, with timed=True, the time spent in each parser.
+    """
+    with open(file_path, "rb") as f:
+        f.seek(start)
+        chunk = f.read(end - start)
+
+    source = io.BytesIO(b"<HealthData>" + chunk + b"</HealthData>")
+    dispatcher = ParserDispatcher(
+        parsers, backend, high_water_marks, date_filter, timed
+    )
+    dispatcher.run(source)
+    return (
+        [parser.data for parser in parsers],
+        dispatcher.latest,
+        dispatcher.failed_parsers,
+        dispatcher.timings,
+    )
+
+
+def parse_in_parallel(
+    file_path: str,
+    parsers: list,
+    workers: int,
+    backend: str = None,
+    high_water_marks: dict = None,
+    date_filter=None,
+    timings: dict = None,
+) -> tuple:
+    """
+    Parses the file across a process pool and merges each parser's data in file order.
+    Returns the latest creationDate seen per routing value (only tracked with high_water_marks)
+    and the parsers that failed in any range, with their first error.
+    If a timings dict is given, the time spent in each parser is added to it.
+    """
+    size = os.path.getsize(file_path)
+    ranges = max(workers, -(-size // MAX_RANGE_BYTES))
+    byte_ranges = find_byte_ranges(file_path, ranges)
+    logger.info(
+        f"Parsing {file_path} in {len(byte_ranges)} byte ranges with {workers} workers."
+    )
+
+    # Tasks are pickled lazily, so they get copies the merge below never touches
+    templates = copy.deepcopy(parsers)
+    latest = {}
+    failed_parsers = {}
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(
+                parse_range,
+                file_path,
+                start,
+                end,
+                templates,
+                backend,
+                high_water_marks,
+                date_filter,
+                timings is not None,
+            )
+            for start, end in byte_ranges
+        ]
+        # Results are merged in range order so the output matches a serial pass
+        for future in futures:
+            range_data, range_latest, range_failed, range_timings = future.result()
+            for parser, data in zip(parsers, range_data):
+                parser.data.extend(data)
+            for key, stamp in range_latest.items():
+                latest[key] = max(stamp, latest.get(key, stamp))
+            for name, error in range_failed.items():
+                failed_parsers.setdefault(name, error)
+            for name, (seconds, count) in (range_timings or {}).items():
+                timing = timings.setdefault(name, [0.0, 0])
+                timing[0] += seconds
+                timing[1] += count
+
+    return latest, failed_parsers
@@ -0,0 +1,48 @@
+# src/parsers/record_parser.py
+import numpy as np
+
+from src.parsers.base_parser import BaseParser
+from src.parsers.columnar import ColumnarRecords
+from src.parsers.registry import get_record_types
+
+
+class RecordTypeParser(BaseParser):
+    """A generic parser for the registered quantity records of one category."""
+
+    category: str = None
+    flat_records = True
+
+    def __init__(self, file_path: str):
+        super().__init__(file_path)
+        # Compile the registry into a single HK identifier -> display name lookup
+        self.names = {
+            identifier: record_type.name
+            for identifier, record_type in get_record_types(self.category).items()
+        }
+        self.record_types = tuple(self.names)
+        self.data = ColumnarRecords()
+
+    def handle_element(self, elem):
+        """Processes a "Record" element if its type is in the registry."""
+        attrib = elem.attrib
+        name = self.names.get(attrib.get("type"))
+        if name is not None:
+            # Same fields as extract_common_fields, written straight into columns
+            self.data.append(
+                name, attrib.get("startDate"), attrib.get("value"), attrib.get("unit")
+            )
+
+    def handle_records(self, batch):
+        """Appends the registered Records of a RecordBatch, looking up each type once."""
+        names = [self.names.get(record_type) for record_type in batch.type_names]
+        rows = np.array([name is not None for name in names], dtype=bool)[batch.type_codes]
+        if not rows.all():
+            batch = batch.take(rows)
+        self.data.append_batch(
+            names,
+            batch.type_codes,
+            batch.start_dates,
+            batch.values,
+            batch.unit_names,
+            batch.unit_codes,
+        )
@@ -0,0 +1,75 @@
+# src/parsers/registry.py
+from collections import namedtuple
+
+from src.constants.activity import (
+    HK_PHYSICAL_EFFORT,
+    HK_STEP_COUNT,
+    HK_FLIGHTS_CLIMBED,
+    HK_EXERCISE_TIME,
+    HK_ENERGY_BURNED,
+)
+from src.constants.health import (
+    HK_RESTING_HEARTRATE,
+    HK_RUNNING_POWER,
+    HK_RUNNING_SPEED,
+    HK_RUNNING_VERTICAL_OSCILLATION,
+    HK_VO2_MAX,
+    HK_HEARTRATE_RECOVERY,
+    HK_WALKING_STEP_LENGTH,
+    HK_RESPIRATORY_RATE,
+    HK_WALKING_SPEED,
+    HK_STAIR_ASCENT_SPEED,
+    HK_WALKING_HEARTRATE,
+    HK_RUNNING_STRIDE_LENGTH,
+    HK_RUNNING_GROUND_CONTACT_TIME,
+)
+
+RecordType = namedtuple("RecordType", ["name", "category", "aggregation"])
+
+# Bump whenever the parsers produce different output for the same export,
+# so cached parses (see src/parse_cache.py) are invalidated.
+# 3: drops entries cached before failed parsers aborted the run
+REGISTRY_VERSION = 3
+
+# HK identifier -> display name, data category and daily aggregation.
+# Adding a metric only requires a new entry here.
+RECORD_TYPES = {
+    # Health
+    HK_RESTING_HEARTRATE: RecordType("Resting Heartrate", "health", "mean"),
+    HK_VO2_MAX: RecordType("VO2 Max", "health", "mean"),
+    HK_HEARTRATE_RECOVERY: RecordType("Heartrate Recovery", "health", "mean"),
+    HK_WALKING_STEP_LENGTH: RecordType("Walking Step Length", "health", "mean"),
+    HK_RESPIRATORY_RATE: RecordType("Respiratory Rate", "health", "mean"),
+    HK_WALKING_SPEED: RecordType("Walking Speed", "health", "mean"),
+    HK_STAIR_ASCENT_SPEED: RecordType("Stair Ascent Speed", "health", "mean"),
+    HK_WALKING_HEARTRATE: RecordType("Walking Heartrate", "health", "mean"),
+    HK_RUNNING_STRIDE_LENGTH: RecordType("Running Stride Length", "health", "mean"),
+    HK_RUNNING_GROUND_CONTACT_TIME: RecordType(
+        "Running Ground Contact Time", "health", "mean"
+    ),
+    HK_RUNNING_VERTICAL_OSCILLATION: RecordType(
+        "Running Vertical Oscillation", "health", "mean"
+    ),
+    HK_RUNNING_SPEED: RecordType("Running Speed", "health", "mean"),
+    HK_RUNNING_POWER: RecordType("Running Power", "health", "mean"),
+    # Activity
+    HK_ENERGY_BURNED: RecordType("Energy Burned", "activity", "sum"),
+    HK_EXERCISE_TIME: RecordType("Exercise Time", "activity", "sum"),
+    HK_PHYSICAL_EFFORT: RecordType("Physical Effort", "activity", "sum"),
+    HK_STEP_COUNT: RecordType("Step Count", "activity", "sum"),
+    HK_FLIGHTS_CLIMBED: RecordType("Flights Climbed", "activity", "sum"),
+}
+
+
+def get_aggregations() -> dict:
+    """Returns the daily aggregation ("sum" or "mean") of every registered metric, keyed by display name."""
+    return {record_type.name: record_type.aggregation for record_type in RECORD_TYPES.values()}
+
+
+def get_record_types(category: str = None) -> dict:
+    """Returns the registry entries for a category, or all entries if no category is given."""
+    return {
+        identifier: record_type
+        for identifier, record_type in RECORD_TYPES.items()
+        if category is None or record_type.category == category
+    }
@@ -0,0 +1,265 @@
+# src/parsers/scanner.py
+import html
+import re
+import xml.etree.ElementTree as ET
+
+import numpy as np
+
+from src.constants.export import ROUTING_ATTRIBUTES
+
+CHUNK_BYTES = 16 * 1024 * 1024
+
+# The fixed attribute layout Apple uses for quantity and category Records. Only the
+# attributes the parsers read are captured: type, unit, creationDate, startDate, endDate
+# and value; children (metadata) are skipped. TYPES is replaced by the types to capture.
+RECORD_LAYOUT = (
+    rb'Record type="(TYPES)" sourceName="[^"]*"'
+    rb'(?: sourceVersion="[^"]*")?(?: device="[^"]*")?'
+    rb'(?: unit="([^"]*)")? creationDate=CREATED'
+    rb' startDate="([^"]*)" endDate="([^"]*)"'
+    rb'(?: value="([^"]*)")?\s*(?:/>|>.*?</Record>)'
+)
+ATTRIBUTES = rb'(?:\s+[\w:.-]+\s*=\s*"[^"]*")*\s*'
+RECORD_FIELDS = ("type", "unit", "creationDate", "startDate", "endDate", "value")
+
+
+class RecordBatch:
+    """
+    Consecutive Records matched in Apple's layout, in columns. Types and units are
+    dictionary encoded: names plus the index of each row's name (None for no unit).
+    Dates and values are NumPy byte string arrays, b"" when missing; creation dates
+    are also b"" unless they were requested. An empty attribute reads as a missing one.
+    """
+
+    def __init__(
+        self,
+        type_names: list,
+        type_codes: np.ndarray,
+        unit_names: list,
+        unit_codes: np.ndarray,
+        creation_dates: np.ndarray,
+        start_dates: np.ndarray,
+        end_dates: np.ndarray,
+        values: np.ndarray,
+    ):
+        self.type_names = type_names
+        self.type_codes = type_codes
+        self.unit_names = unit_names
+        self.unit_codes = unit_codes
+        self.creation_dates = creation_dates
+        self.start_dates = start_dates
+        self.end_dates = end_dates
+        self.values = values
+
+    @classmethod
+    def from_matches(cls, matches: list, escaped: bool = True) -> "RecordBatch":
+        """
+        Builds the columns from findall matches, whose first groups are RECORD_FIELDS.
+        With escaped set, XML entities such as "&amp;" are replaced where they occur.
+        """
+        types, units, creation_dates, start_dates, end_dates, values = list(
+            zip(*matches)
+        )[: len(RECORD_FIELDS)]
+        type_names, type_codes = _dictionary_encode(types)
+        unit_names, unit_codes = _dictionary_encode(units)
+        columns = [
+            np.array(column, dtype=bytes)
+            for column in (creation_dates, start_dates, end_dates, values)
+        ]
+        if escaped:
+            type_names = [_unescape(name) for name in type_names]
+            unit_names = [_unescape(name) for name in unit_names]
+            columns = [_unescape_column(column) for column in columns]
+        return cls(type_names, type_codes, unit_names, unit_codes, *columns)
+
+    def __len__(self) -> int:
+        return len(self.type_codes)
+
+    def take(self, rows) -> "RecordBatch":
+        """Returns the rows selected by a boolean mask or an index array."""
+        return RecordBatch(
+            self.type_names,
+            self.type_codes[rows],
+            self.unit_names,
+            self.unit_codes[rows],
+            self.creation_dates[rows],
+            self.start_dates[rows],
+            self.end_dates[rows],
+            self.values[rows],
+        )
+
+    def rows(self):
+        """Yields (type, startDate, endDate, value, unit) strings, None for missing ones."""
+        for type_code, start_date, end_date, value, unit_code in zip(
+            self.type_codes.tolist(),
+            self.start_dates.tolist(),
+            self.end_dates.tolist(),
+            self.values.tolist(),
+            self.unit_codes.tolist(),
+        ):
+            yield (
+                self.type_names[type_code],
+                start_date.decode(),
+                end_date.decode(),
+                value.decode() if value else None,
+                self.unit_names[unit_code],
+            )
+
+
+def _dictionary_encode(column: tuple) -> tuple:
+    """Returns the distinct byte strings of column, decoded (b"" as None), and their codes."""
+    index: dict = {}
+    codes = np.array([index.setdefault(value, len(index)) for value in column], dtype=np.intp)
+    return [value.decode() if value else None for value in index], codes
+
+
+def _unescape(name):
+    return html.unescape(name) if name and "&" in name else name
+
+
+def _unescape_column(column: np.ndarray) -> np.ndarray:
+    rows = np.flatnonzero(np.char.find(column, b"&") >= 0)
+    if len(rows):
+        # Unescaped text is never longer, so it fits the same width
+        column = column.copy()
+        for row in rows:
+            column[row] = html.unescape(column[row].decode()).encode()
+    return column
+
+
+def compile_scan_pattern(tags, record_types=(), creation_dates: bool = True) -> re.Pattern:
+    """
+    Compiles the byte regex that findall runs over each chunk. Every match is a tuple of
+    the six RECORD_FIELDS groups for a Record of record_types in Apple's layout, then the
+    text of any other routed element (parsed with xml.etree), its tag, and finally the
+    rest of the chunk from a routed element that does not end within it.
+    If tags maps a tag to a set of routing attribute values, elements whose first
+    attribute is a different value are not matched at all.
+    """
+    starts = []
+    for tag in tags:
+        values = tags.get(tag) if isinstance(tags, dict) else None
+        attribute = ROUTING_ATTRIBUTES.get(tag)
+        escaped_tag = re.escape(tag.encode())
+        if values is None or attribute is None:
+            starts.append(escaped_tag + rb"(?=[\s/>])")
+            continue
+        key = re.escape(attribute.encode()) + b'="'
+        escaped_values = alternation(values)
+        # Either a routed value, or an unusual layout that the dispatcher filters
+        routed = key + rb"(?:" + escaped_values + rb')"|(?!' + key + b")"
+        starts.append(escaped_tag + rb"(?=\s(?:" + routed + rb"))")
+    start = b"|".join(starts)
+
+    layout = RECORD_LAYOUT.replace(
+        b"CREATED", b'"([^"]*)"' if creation_dates else b'"[^"]*"()'
+    )
+    if record_types:
+        layout = layout.replace(b"TYPES", alternation(record_types))
+    else:
+        # Never matches, but keeps the group numbers
+        layout = layout.replace(b"TYPES", b"(?!)")
+
+    element = rb"((" + start + rb")" + ATTRIBUTES + rb"(?:/>|>.*?</\8>))"
+    rest = rb"((?:" + start + rb").*)"
+    # At each "<" the layout is tried first, then the whole element. The groups start
+    # after the "<" so that the regex engine can search for it as a literal prefix.
+    return re.compile(b"<(?:" + layout + b"|" + element + b"|" + rest + b")", re.DOTALL)
+
+
+def alternation(values) -> bytes:
+    """
+    Returns a byte regex matching any of values, as a trie of their common prefixes.
+    The regex engine tries the branches of an alternation one by one, and the record
+    types all share long prefixes such as "HKQuantityTypeIdentifier".
+    """
+    trie: dict = {}
+    for value in values:
+        node = trie
+        for byte in value.encode():
+            node = node.setdefault(byte, {})
+        node[None] = {}
+    return _trie_pattern(trie)
+
+
+def _trie_pattern(node: dict) -> bytes:
+    """Returns the regex for a trie node; the None key marks the end of a value."""
+    children = sorted((byte, child) for byte, child in node.items() if byte is not None)
+    branches = [re.escape(bytes([byte])) + _trie_pattern(child) for byte, child in children]
+    if not branches:
+        return b""
+    if len(branches) == 1 and None not in node:
+        return branches[0]
+    pattern = b"(?:" + b"|".join(branches) + b")"
+    return pattern + b"?" if None in node else pattern
+
+
+def scan_export(source, tags, record_types=(), creation_dates: bool = True):
+    """
+    Scans large binary chunks of the export with one compiled byte regex and findall.
+    Runs of Records of record_types in Apple's layout are yielded as a RecordBatch,
+    without building an element per Record; creation dates are only captured if
+    creation_dates is set. Every other routed element is parsed with xml.etree and
+    yielded as is, in file order.
+    """
+    if isinstance(source, str):
+        with open(source, "rb") as f:
+            yield from scan_export(f, tags, record_types, creation_dates)
+        return
+
+    pattern = compile_scan_pattern(tags, record_types, creation_dates)
+    buffer = b""
+    eof = False
+
+    while not eof:
+        chunk = source.read(CHUNK_BYTES)
+        eof = not chunk
+        buffer += chunk
+        # Only scan complete lines until the whole file has been read
+        limit = len(buffer) if eof else buffer.rfind(b"\n") + 1
+        escaped = b"&" in buffer
+        position = limit
+
+        matches = pattern.findall(buffer, 0, limit)
+        if matches and matches[-1][8]:
+            rest = matches.pop()[8]
+            if eof:
+                raise ET.ParseError(f"Unterminated element at: <{rest[:80]!r}")
+            # The element continues past the scanned lines; read more first
+            position = limit - len(rest) - 1
+
+        first = 0
+        for index, match in enumerate(matches):
+            if match[6]:
+                if index > first:
+                    yield RecordBatch.from_matches(matches[first:index], escaped)
+                yield ET.fromstring(b"<" + match[6])
+                first = index + 1
+        if len(matches) > first:
+            yield RecordBatch.from_matches(matches[first:] if first else matches, escaped)
+
+        buffer = buffer[position:]
+
+
+def iter_elements_scanner(source, tags):
+    """
+    Yields elements whose tag is in tags, like the other backends.
+    Records in Apple's layout become plain Elements built from the scanned attributes;
+    ParserDispatcher.run uses scan_export directly and skips building them.
+    """
+    record_types = (tags.get("Record") or ()) if isinstance(tags, dict) else ()
+    for item in scan_export(source, tags, record_types):
+        if not isinstance(item, RecordBatch):
+            yield item
+            continue
+        for record, created in zip(item.rows(), item.creation_dates.tolist()):
+            record_type, start_date, end_date, value, unit = record
+            attrib = {
+                "type": record_type,
+                "unit": unit,
+                "creationDate": created.decode(),
+                "startDate": start_date,
+                "endDate": end_date,
+                "value": value,
+            }
+            yield ET.Element("Record", {key: text for key, text in attrib.items() if text})
@@ -4,20 +4,27 @@ from src.parsers.base_parser import BaseParser
 
 
 class SleepDataParser(BaseParser):
+    record_types = (HK_RECORDS_SLEEP_ANALYSIS,)
+    flat_records = True
+
     def handle_element(self, elem):
         """Processes an XML element and extracts relevant health record data."""
         if elem.tag == "Record":
-            record_type: str = elem.attrib.get("type")
-            record_value: str = elem.attrib.get("value")
+            attrib = elem.attrib
+            self.handle_record(
+                attrib.get("type"),
+                attrib.get("startDate"),
+                attrib.get("endDate"),
+                attrib.get("value"),
+                attrib.get("unit"),
+            )
 
-            if (
-                record_type == HK_RECORDS_SLEEP_ANALYSIS
-                and record_value in SLEEP_CATEGORIES
-            ):
-                record = {
-                    "start_time": elem.attrib.get("startDate"),
-                    "end_time": elem.attrib.get("endDate"),
-                    "value": record_value,
-                    "type": "Sleep Analysis",
-                }
-                self.data.append(record)
+    def handle_record(self, record_type, start_date, end_date, value, unit):
+        if record_type == HK_RECORDS_SLEEP_ANALYSIS and value in SLEEP_CATEGORIES:
+            record = {
+                "start_time": start_date,
+                "end_time": end_date,
+                "value": value,
+                "type": "Sleep Analysis",
+            }
+            self.data.append(record)
@@ -1,25 +1,72 @@
 # src/parsers/workout_parsers.py
-from src.parsers.base_parser import BaseParser
+import math
+
+from src.constants.workout import (
+    HK_METADATA_ENTRY,
+    HK_METADATA_INDOOR_WORKOUT,
+    HK_WORKOUT_EVENT,
+    HK_WORKOUT_STATISTICS,
+    WORKOUT_STATISTICS,
+    WORKOUT_TOTAL_ATTRIBUTES,
+)
+from src.parsers.base_parser import BaseParser, to_float
 
 
 class WorkoutDataParser(BaseParser):
+    tag = "Workout"
+
     def __init__(self, file_path: str, workout_type: str = None):
         """Initializes the WorkoutParser with the specified file path and workout type."""
         super().__init__(file_path)
         self.workout_type = workout_type  # Can be None to parse all types
+        if workout_type is not None:
+            self.record_types = (workout_type,)
 
     def handle_element(self, elem):
-        if elem.tag == "Workout":
-            # Parse all workouts if workout_type is None, otherwise filter by workout type
-            if (
-                self.workout_type is None
-                or elem.attrib.get("workoutActivityType") == self.workout_type
-            ):
-                record = {
-                    "date": elem.attrib.get("startDate"),
-                    "duration": elem.attrib.get("duration"),
-                    "workout_type": elem.attrib.get("workoutActivityType"),
-                    "type": "Workout",
-                    
-                }
-            self.data.append(record)
+        """Extracts a workout and its nested statistics, events and metadata."""
+        if elem.tag != "Workout":
+            return
+        # Parse all workouts if workout_type is None, otherwise filter by workout type
+        workout_type = elem.attrib.get("workoutActivityType")
+        if self.workout_type is not None and workout_type != self.workout_type:
+            return
+
+        record = {
+            "date": elem.attrib.get("startDate"),
+            "duration": to_float(elem.attrib.get("duration")),
+            "workout_type": workout_type,
+            "type": "Workout",
+            "energy_burned": math.nan,
+            "distance": math.nan,
+            "distance_unit": None,
+            "average_heart_rate": math.nan,
+            "max_heart_rate": math.nan,
+            "event_count": 0,
+            "indoor": False,
+        }
+        # The backend clears the element's subtree once every parser has seen it
+        for child in elem:
+            if child.tag == HK_WORKOUT_STATISTICS:
+                statistic_type = child.attrib.get("type")
+                for column, attribute in WORKOUT_STATISTICS.get(statistic_type, ()):
+                    record[column] = to_float(child.attrib.get(attribute))
+                if (
+                    record["distance_unit"] is None
+                    and statistic_type is not None
+                    and "Distance" in statistic_type
+                ):
+                    record["distance_unit"] = child.attrib.get("unit")
+            elif child.tag == HK_WORKOUT_EVENT:
+                record["event_count"] += 1
+            elif child.tag == HK_METADATA_ENTRY:
+                if child.attrib.get("key") == HK_METADATA_INDOOR_WORKOUT:
+                    record["indoor"] = child.attrib.get("value") == "1"
+
+        # Older exports only carry totals on the Workout element itself
+        for column, attribute in WORKOUT_TOTAL_ATTRIBUTES.items():
+            if math.isnan(record[column]) and attribute in elem.attrib:
+                record[column] = to_float(elem.attrib[attribute])
+        if record["distance_unit"] is None:
+            record["distance_unit"] = elem.attrib.get("totalDistanceUnit")
+
+        self.data.append(record)
@@ -0,0 +1,103 @@
+# src/partitions.py
+import os
+import re
+import shutil
+
+import pandas as pd
+from loguru import logger
+
+from src.dates import date_keys
+from src.utils import load_frame_from_file, save_frame_to_file
+
+PARTITION_PATTERN = re.compile(r"year=(\d{4})/month=(\d{2})$")
+PARTITION_FILE_NAME = "part"
+
+
+def partition_path(directory: str, category: str, year: int, month: int) -> str:
+    """Returns the directory of one year/month partition of a category."""
+    return os.path.join(directory, category, f"year={year:04d}", f"month={month:02d}")
+
+
+def list_partitions(directory: str, category: str) -> list:
+    """Returns the sorted (year, month) partitions stored for a category."""
+    category_directory = os.path.join(directory, category)
+    if not os.path.isdir(category_directory):
+        return []
+
+    partitions = []
+    for year_name in os.listdir(category_directory):
+        year_directory = os.path.join(category_directory, year_name)
+        if not os.path.isdir(year_directory):
+            continue
+        for month_name in os.listdir(year_directory):
+            match = PARTITION_PATTERN.match(f"{year_name}/{month_name}")
+            if match:
+                partitions.append((int(match.group(1)), int(match.group(2))))
+    return sorted(partitions)
+
+
+def write_partitions(
+    data: pd.DataFrame, directory: str, category: str, months: set = None
+) -> None:
+    """
+    Writes a cleaned DataFrame as category/year=YYYY/month=MM/ partitions, split on its 'date' column.
+    With months (a set of "YYYY-MM" strings) only those partitions are rewritten;
+    otherwise every partition is rewritten and partitions missing from data are removed.
+    """
+    data = data.assign(date=pd.to_datetime(data["date"]))
+    keys = date_keys(data["date"]).str[:7]
+
+    written = set()
+    for key, part in data.groupby(keys, sort=True):
+        if months is not None and key not in months:
+            continue
+        year, month = int(key[:4]), int(key[5:7])
+        save_frame_to_file(
+            part.reset_index(drop=True),
+            partition_path(directory, category, year, month),
+            PARTITION_FILE_NAME,
+        )
+        written.add((year, month))
+
+    # Partitions that no longer have any rows
+    for year, month in list_partitions(directory, category):
+        key = f"{year:04d}-{month:02d}"
+        if (year, month) in written or (months is not None and key not in months):
+            continue
+        logger.info(f"Removing empty partition {key} of {category}.")
+        shutil.rmtree(partition_path(directory, category, year, month))
+
+
+def read_partitions(
+    directory: str, category: str, start=None, end=None, columns: list = None
+) -> pd.DataFrame:
+    """
+    Reads the partitions of a category overlapping the inclusive start/end days.
+    Only matching partitions are opened and only the requested columns (plus 'date') are read.
+    Returns None if no partition overlaps the range.
+    """
+    start = pd.Timestamp(start) if start is not None else None
+    end = pd.Timestamp(end) if end is not None else None
+    if columns is not None and "date" not in columns:
+        columns = ["date"] + list(columns)
+
+    frames = []
+    for year, month in list_partitions(directory, category):
+        if start is not None and (year, month) < (start.year, start.month):
+            continue
+        if end is not None and (year, month) > (end.year, end.month):
+            continue
+        path = os.path.join(
+            partition_path(directory, category, year, month), PARTITION_FILE_NAME
+        )
+        frames.append(load_frame_from_file(path, columns=columns))
+
+    if not frames:
+        return None
+
+    df = pd.concat(frames, ignore_index=True)
+    if start is not None:
+        df = df[df["date"] >= start.normalize()]
+    if end is not None:
+        df = df[df["date"] < end.normalize() + pd.Timedelta(days=1)]
+    return df.reset_index(drop=True)
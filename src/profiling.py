@@ -0,0 +1,160 @@
+# src/profiling.py
+import cProfile
+import io
+import json
+import os
+import platform
+import pstats
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+
+from loguru import logger
+
+from src.constants.paths import RUN_REPORT_DIRECTORY
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+# Comma separated list of "cprofile" and/or "tracemalloc" to dump per top-level stage
+PROFILE_ENV = "HEALTH_PARSER_PROFILE"
+TRACEMALLOC_TOP_LINES = 25
+
+
+def peak_rss_bytes():
+    """Returns the peak resident set size of this process in bytes, or None if unknown."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def cpu_seconds() -> float:
+    """Returns the CPU time of this process and its finished child processes."""
+    times = os.times()
+    return time.process_time() + times.children_user + times.children_system
+
+
+def profile_modes() -> set:
+    """Returns the dumps requested through the HEALTH_PARSER_PROFILE environment variable."""
+    value = os.environ.get(PROFILE_ENV, "")
+    return {mode.strip().lower() for mode in value.split(",") if mode.strip()}
+
+
+class RunProfiler:
+    """
+    Collects per-stage metrics of a pipeline run: wall time, CPU time, peak RSS delta,
+    records in/out and bytes read. Stages may nest; their names are dotted paths
+    such as "parse.health". With detailed=True the dispatcher also times every parser.
+    """
+
+    def __init__(
+        self,
+        run_id: str = None,
+        detailed: bool = False,
+        directory: str = RUN_REPORT_DIRECTORY,
+    ):
+        self.run_id = run_id or datetime.now().strftime("%Y%m%d-%H%M%S")
+        self.detailed = detailed
+        self.directory = directory
+        self.modes = profile_modes()
+        self.stages: list = []
+        self.active: list = []
+
+    @contextmanager
+    def stage(self, name: str, **fields):
+        """
+        Measures the enclosed block. Yields the stage's metrics dict, so the block can
+        fill in records_in, records_out, bytes_read or any other field.
+        """
+        name = ".".join(self.active + [name])
+        metrics = {
+            "name": name,
+            "records_in": None,
+            "records_out": None,
+            "bytes_read": None,
+        }
+        metrics.update(fields)
+        # Profilers cannot nest, so only top-level stages are dumped
+        top_level = not self.active
+        profiler = cProfile.Profile() if top_level and "cprofile" in self.modes else None
+        tracing = top_level and "tracemalloc" in self.modes and not tracemalloc.is_tracing()
+
+        self.active.append(name.rsplit(".", 1)[-1])
+        if tracing:
+            tracemalloc.start()
+        if profiler is not None:
+            profiler.enable()
+        peak_before = peak_rss_bytes()
+        cpu_start = cpu_seconds()
+        start = time.perf_counter()
+        try:
+            yield metrics
+        finally:
+            metrics["wall_time"] = time.perf_counter() - start
+            metrics["cpu_time"] = cpu_seconds() - cpu_start
+            peak_after = peak_rss_bytes()
+            # The peak only grows, so the delta is how far this stage raised it
+            metrics["peak_rss_delta"] = (
+                None if peak_after is None else peak_after - peak_before
+            )
+            if profiler is not None:
+                profiler.disable()
+                metrics["cprofile"] = self.dump_cprofile(name, profiler)
+            if tracing:
+                metrics["tracemalloc_peak"] = tracemalloc.get_traced_memory()[1]
+                metrics["tracemalloc"] = self.dump_tracemalloc(name)
+                tracemalloc.stop()
+            self.active.pop()
+            self.stages.append(metrics)
+            logger.info(
+                f"Stage {name}: {metrics['wall_time']:.2f}s wall, "
+                f"{metrics['cpu_time']:.2f}s CPU, records out: {metrics['records_out']}"
+            )
+
+    def dump_path(self, name: str, suffix: str) -> str:
+        os.makedirs(self.directory, exist_ok=True)
+        return os.path.join(self.directory, f"{self.run_id}_{name}{suffix}")
+
+    def dump_cprofile(self, name: str, profiler: cProfile.Profile) -> str:
+        """Saves the profile (for pstats/snakeviz) and logs its top functions."""
+        path = self.dump_path(name, ".prof")
+        profiler.dump_stats(path)
+        summary = io.StringIO()
+        pstats.Stats(profiler, stream=summary).sort_stats("cumulative").print_stats(10)
+        logger.debug(summary.getvalue())
+        return path
+
+    def dump_tracemalloc(self, name: str) -> str:
+        """Saves the lines that allocated the most memory still held at the end of the stage."""
+        path = self.dump_path(name, "_tracemalloc.txt")
+        statistics = tracemalloc.take_snapshot().statistics("lineno")
+        with open(path, "w") as f:
+            for statistic in statistics[:TRACEMALLOC_TOP_LINES]:
+                f.write(f"{statistic}\n")
+        return path
+
+    def report(self) -> dict:
+        """Returns the run report, with stages in the order they finished."""
+        return {
+            "run_id": self.run_id,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "stages": self.stages,
+        }
+
+    def save_report(self) -> str:
+        """Writes the run report as JSON and returns its path."""
+        path = self.dump_path("report", ".json")
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "w") as f:
+            json.dump(self.report(), f, indent=4)
+        os.replace(temp_path, path)
+        logger.info(f"Run report saved to {path}")
+        return path
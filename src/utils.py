@@ -1,18 +1,32 @@
 # utils.py
 import json
 import os
+import numpy as np
 import pandas as pd
 from loguru import logger
 
+try:
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow is optional, .npz is used without it
+    pq = None
+
+FRAME_EXTENSIONS = (".parquet", ".npz")
+# Appended rows go in "<name>.part-000001.parquet" files next to the saved frame,
+# which are merged into it once there are more than MAX_FRAME_PARTS
+FRAME_PART_SEPARATOR = ".part-"
+MAX_FRAME_PARTS = 32
+
 
 def convert_to_json(data: list) -> str:
     return json.dumps(data, indent=4)
 
 
-def save_json_to_file(data: list, directory: str, filename: str) -> None:
+def save_json_to_file(
+    data: list, directory: str, filename: str, overwrite: bool = True
+) -> None:
     """
     Save JSON data to a file in the specified directory.
-    If the file already exists, it won't be overwritten.
+    The file is replaced atomically, unless it exists and overwrite is False.
     """
 
     # Create directory if it does not exist
@@ -22,13 +36,209 @@ def save_json_to_file(data: list, directory: str, filename: str) -> None:
     # Define the full path for the output file
     file_path = os.path.join(directory, filename)
 
-    # Check if the file already exists
-    if os.path.isfile(file_path):
+    # Check if the file already exists and handle overwrite
+    if os.path.isfile(file_path) and not overwrite:
         return
 
     # Save the JSON data to a file
-    with open(file_path, "w") as json_file:
+    temp_path = f"{file_path}.tmp"
+    with open(temp_path, "w") as json_file:
         json.dump(data, json_file, indent=4)
+    os.replace(temp_path, file_path)
+
+
+def records_to_dataframe(data) -> pd.DataFrame:
+    """Converts parsed data (a columnar accumulator or a list of dicts) to a DataFrame."""
+    if hasattr(data, "to_dataframe"):
+        return data.to_dataframe()
+    return pd.DataFrame(data)
+
+
+def save_frame_to_file(data: pd.DataFrame, directory: str, name: str) -> str:
+    """
+    Save a DataFrame in a binary columnar format in the specified directory.
+    Uses Parquet when pyarrow is installed, otherwise a compressed .npz archive.
+    The file is replaced atomically and its path is returned.
+    """
+
+    # Create directory if it does not exist
+    if not os.path.exists(directory):
+        os.makedirs(directory)
+
+    extension = ".parquet" if pq is not None else ".npz"
+    file_path = os.path.join(directory, f"{name}{extension}")
+    temp_path = f"{file_path}.tmp"
+
+    if pq is not None:
+        data.to_parquet(temp_path, index=False)
+    else:
+        with open(temp_path, "wb") as npz_file:
+            np.savez_compressed(npz_file, **frame_to_arrays(data))
+    os.replace(temp_path, file_path)
+
+    # Remove a stale copy in the other format so it is never loaded instead
+    for other_extension in FRAME_EXTENSIONS:
+        other_path = os.path.join(directory, f"{name}{other_extension}")
+        if other_extension != extension and os.path.isfile(other_path):
+            os.remove(other_path)
+    # Rows appended to the previous file are part of the new one (or replaced by it)
+    for part_path in frame_part_paths(os.path.join(directory, name)):
+        os.remove(part_path)
+
+    logger.info(f"Data saved to: {file_path}")
+    return file_path
+
+
+def append_frame_to_file(data: pd.DataFrame, directory: str, name: str) -> str:
+    """
+    Append rows to a DataFrame saved by save_frame_to_file, creating it if needed.
+    The rows are written to a new part file, so the existing data is not rewritten
+    until the parts are merged into the saved frame. Returns the written path.
+    """
+    path = os.path.join(directory, name)
+    if find_frame_file(path) is None:
+        return save_frame_to_file(data, directory, name)
+
+    part_paths = frame_part_paths(path)
+    if len(part_paths) >= MAX_FRAME_PARTS:
+        # Merge the parts and the new rows into the saved frame (which removes the parts)
+        data = pd.concat([load_frame_from_file(path), data], ignore_index=True)
+        return save_frame_to_file(data, directory, name)
+
+    number = 1
+    if part_paths:
+        stem = os.path.splitext(os.path.basename(part_paths[-1]))[0]
+        number = int(stem.rsplit(FRAME_PART_SEPARATOR, 1)[1]) + 1
+    return save_frame_to_file(data, directory, f"{name}{FRAME_PART_SEPARATOR}{number:06d}")
+
+
+def find_frame_file(path: str):
+    """Returns the saved file for a path without extension, or None if there is none."""
+    for extension in FRAME_EXTENSIONS:
+        if os.path.isfile(f"{path}{extension}"):
+            return f"{path}{extension}"
+    return None
+
+
+def frame_part_paths(path: str) -> list:
+    """Returns the part files appended to the frame saved at path, in append order."""
+    directory, name = os.path.split(path)
+    if not os.path.isdir(directory or "."):
+        return []
+    prefix = f"{name}{FRAME_PART_SEPARATOR}"
+    parts = []
+    for filename in os.listdir(directory or "."):
+        stem, extension = os.path.splitext(filename)
+        number = stem[len(prefix) :]
+        if stem.startswith(prefix) and extension in FRAME_EXTENSIONS and number.isdigit():
+            parts.append((int(number), os.path.join(directory, filename)))
+    return [part_path for _, part_path in sorted(parts)]
+
+
+def frame_file_paths(path: str) -> list:
+    """Returns the saved file for a path without extension followed by its parts."""
+    file_path = find_frame_file(path)
+    if file_path is None:
+        return []
+    return [file_path] + frame_part_paths(path)
+
+
+def load_frame_from_file(path: str, columns: list = None):
+    """
+    Load a DataFrame saved by save_frame_to_file (and any rows appended to it),
+    reading only the requested columns. The path is given without extension.
+    Returns None if no file exists.
+    """
+    file_paths = frame_file_paths(path)
+    if not file_paths:
+        return None
+
+    frames = [read_frame_file(file_path, columns) for file_path in file_paths]
+    if len(frames) == 1:
+        return frames[0]
+    return pd.concat(frames, ignore_index=True)
+
+
+def read_frame_file(file_path: str, columns: list = None) -> pd.DataFrame:
+    """Reads a single Parquet or .npz file, loading only the requested columns."""
+    if file_path.endswith(".parquet"):
+        if columns is not None:
+            available = pq.read_schema(file_path).names
+            columns = [column for column in columns if column in available]
+        return pd.read_parquet(file_path, columns=columns)
+
+    with np.load(file_path, allow_pickle=False) as arrays:
+        return arrays_to_frame(arrays, columns)
+
+
+def iter_frame_batches(path: str, columns: list = None, batch_rows: int = 1_000_000):
+    """
+    Yield a DataFrame saved by save_frame_to_file (and any rows appended to it) in
+    batches of at most batch_rows rows. Parquet files are streamed, so only one batch
+    is held in memory; an .npz archive has to be decompressed whole and is only sliced.
+    Yields nothing if no file exists.
+    """
+    for file_path in frame_file_paths(path):
+        if file_path.endswith(".parquet"):
+            parquet_file = pq.ParquetFile(file_path)
+            file_columns = columns
+            if columns is not None:
+                available = parquet_file.schema_arrow.names
+                file_columns = [column for column in columns if column in available]
+            for batch in parquet_file.iter_batches(
+                batch_size=batch_rows, columns=file_columns
+            ):
+                yield batch.to_pandas()
+            continue
+
+        data = read_frame_file(file_path, columns=columns)
+        for start in range(0, len(data), batch_rows):
+            yield data.iloc[start : start + batch_rows]
+
+
+def frame_to_arrays(data: pd.DataFrame) -> dict:
+    """Encodes DataFrame columns as plain NumPy arrays for np.savez, plus a JSON schema."""
+    arrays = {}
+    schema = {}
+    for column in data.columns:
+        series = data[column]
+        if pd.api.types.is_datetime64_any_dtype(series.dtype):
+            arrays[column] = series.to_numpy(dtype="datetime64[ns]").view(np.int64)
+            kind = "datetime"
+        elif pd.api.types.is_bool_dtype(series.dtype) or (
+            pd.api.types.is_numeric_dtype(series.dtype)
+            and not isinstance(series.dtype, pd.CategoricalDtype)
+        ):
+            arrays[column] = series.to_numpy()
+            kind = "values"
+        else:
+            # Dictionary-encode strings so no pickled objects are needed
+            codes, uniques = pd.factorize(series)
+            arrays[f"{column}.codes"] = codes.astype(np.int32)
+            arrays[f"{column}.categories"] = np.asarray(uniques).astype(str)
+            kind = "category" if isinstance(series.dtype, pd.CategoricalDtype) else "object"
+        schema[column] = kind
+    arrays["__schema__"] = np.array(json.dumps(schema))
+    return arrays
+
+
+def arrays_to_frame(arrays, columns: list = None) -> pd.DataFrame:
+    """Decodes the arrays written by frame_to_arrays, loading only the requested columns."""
+    schema = json.loads(str(arrays["__schema__"]))
+    data = {}
+    for column, kind in schema.items():
+        if columns is not None and column not in columns:
+            continue
+        if kind in ("category", "object"):
+            values = pd.Categorical.from_codes(
+                arrays[f"{column}.codes"], categories=arrays[f"{column}.categories"]
+            )
+            data[column] = values if kind == "category" else np.asarray(values, dtype=object)
+        elif kind == "datetime":
+            data[column] = arrays[column].view("datetime64[ns]")
+        else:
+            data[column] = arrays[column]
+    return pd.DataFrame(data)
 
 
 def save_csv_to_file(